@@ -0,0 +1,475 @@
+import argparse
+import random
+import timeit
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR, WIN_POINTS
+import rules
+
+
+def random_board(fill=0.5, seed=0, size=BOARD_SIZE):
+    """A board with roughly `fill` of its cells taken at random by either player."""
+    rng = random.Random(seed)
+    return [[rng.choice((PLAYER1_COLOR, PLAYER2_COLOR)) if rng.random() < fill else None
+             for _ in range(size)] for _ in range(size)]
+
+
+def report(name, seconds, calls):
+    print(f"{name:<32} {seconds / calls * 1e6:9.2f} us/call")
+
+
+def bench_scoring(args):
+    """Per-cell placement index and bitboard masks vs. the scanning check_shapes/check_partial_shapes.
+
+    The bitboard backend is first checked against the list scorers on every
+    cell for both players; any disagreement aborts the benchmark.
+    """
+    import bitboard
+
+    board = random_board(args.fill, args.seed)
+    bits = bitboard.BitBoard.from_board(board)
+    cells = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+    calls = args.number * len(cells)
+    rules.get_cell_index()  # build outside the timed region
+    bitboard.shape_masks(BOARD_SIZE)
+
+    for player_color in (PLAYER1_COLOR, PLAYER2_COLOR):
+        for row, col in cells:
+            if (rules.check_shapes(board, row, col, player_color) != bitboard.check_shapes(bits, row, col, player_color)
+                    or abs(rules.check_partial_shapes(board, row, col, player_color) -
+                           bitboard.check_partial_shapes(bits, row, col, player_color)) > 1e-9):
+                raise SystemExit(f"bitboard disagrees with the list scorers at {(row, col)} for {player_color}")
+
+    for name, func, target in (('check_shapes_scan', rules.check_shapes_scan, board),
+                               ('check_shapes', rules.check_shapes, board),
+                               ('bitboard.check_shapes', bitboard.check_shapes, bits),
+                               ('check_partial_shapes_scan', rules.check_partial_shapes_scan, board),
+                               ('check_partial_shapes', rules.check_partial_shapes, board),
+                               ('bitboard.check_partial_shapes', bitboard.check_partial_shapes, bits)):
+        seconds = timeit.timeit(lambda: [func(target, row, col, PLAYER1_COLOR) for row, col in cells],
+                                number=args.number)
+        report(name, seconds, calls)
+
+
+def bench_partial(args):
+    """Whole-board partial-shape scoring for geneticAlgo: per-cell scan vs. NumPy."""
+    from vectorized import partial_shape_points
+
+    for size in args.sizes:
+        board = random_board(args.fill, args.seed, size)
+        number = max(1, args.number * BOARD_SIZE ** 2 // size ** 2)
+        scan = timeit.timeit(lambda: rules.partial_points_scan(board, PLAYER2_COLOR), number=number)
+        vector = timeit.timeit(lambda: partial_shape_points(board, PLAYER2_COLOR), number=number)
+        report(f"partial_points_scan {size}x{size}", scan, number)
+        report(f"partial_shape_points {size}x{size}", vector, number)
+
+
+def bench_search(args):
+    """Minimax with iterative deepening vs. the fuzzy+GA move on the same position."""
+    import time
+
+    board = random_board(args.fill, args.seed)
+    empty = sum(cell is None for line in board for cell in line)
+
+    start = time.perf_counter()
+    for _ in range(args.number):
+        rules.fuzzyLogic(board, PLAYER2_COLOR, PLAYER1_COLOR, empty, 0)
+    report('fuzzyLogic + geneticAlgo', time.perf_counter() - start, args.number)
+
+    table = None
+    if args.table_size:
+        from transposition import TranspositionTable
+        table = TranspositionTable(args.table_size, args.symmetric)
+    stats = rules.SearchStats()
+    move = rules.best_move_for_ai(board, PLAYER2_COLOR, args.depth, args.time_limit, stats, table)
+    print(f"best_move_for_ai: move {move} score {stats.score:.2f} depth {stats.depth} "
+          f"nodes {stats.nodes} in {stats.elapsed:.2f}s ({stats.nodes_per_second():.0f} nodes/sec)")
+    if table is not None:
+        print(f"transposition table: {table.hits} hits, {table.misses} misses ({table.hit_rate():.0%}), "
+              f"{table.stores} stores, {table.overwrites} overwrites")
+
+
+def bench_ordering(args):
+    """Nodes and time for iterative deepening to --depth with each move-ordering heuristic."""
+    from ordering import MoveOrderer
+
+    board = random_board(args.fill, args.seed)
+    configurations = [
+        ('no ordering', None),
+        ('presort only', MoveOrderer(presort=True, killers=False, history=False)),
+        ('killers only', MoveOrderer(presort=False, killers=True, history=False)),
+        ('history only', MoveOrderer(presort=False, killers=False, history=True)),
+        ('killers + history', MoveOrderer(presort=False)),
+        ('all', MoveOrderer()),
+    ]
+    if args.top_k:
+        configurations.append((f'all, top {args.top_k}', MoveOrderer(top_k=args.top_k)))
+
+    for name, orderer in configurations:
+        stats = rules.SearchStats()
+        move = rules.best_move_for_ai(board, PLAYER2_COLOR, args.depth, float('inf'), stats, None, orderer)
+        print(f"{name:<20} move {move} score {stats.score:8.2f} nodes {stats.nodes:8d} "
+              f"time {stats.elapsed:7.2f}s")
+
+
+def bench_parallel(args):
+    """Speedup of the process-pool root search over the serial one at the same depth."""
+    from concurrent.futures import ProcessPoolExecutor
+    from parallel import parallel_best_move
+
+    board = random_board(args.fill, args.seed)
+    # The opening scores, then mid-game ones where lines end at WIN_POINTS
+    for banked in ((0, 0), tuple(args.banked)):
+        print(f"banked points {banked[0]} (to move) vs {banked[1]}:")
+        stats = rules.SearchStats()
+        serial_move = rules.best_move_for_ai(board, PLAYER2_COLOR, args.depth, None, stats, banked=banked)
+        serial_time = stats.elapsed
+        print(f"serial     move {serial_move} score {stats.score:8.2f} nodes {stats.nodes:8d} time {serial_time:7.2f}s")
+
+        for workers in args.workers:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parallel_best_move(board, PLAYER2_COLOR, 0, workers, executor=executor)  # warm the pool up
+                parallel_stats = rules.SearchStats()
+                move = parallel_best_move(board, PLAYER2_COLOR, args.depth, workers, executor=executor,
+                                          stats=parallel_stats, banked=banked)
+            same = move == serial_move and parallel_stats.score == stats.score
+            print(f"{workers:2d} workers move {move} score {parallel_stats.score:8.2f} nodes {parallel_stats.nodes:8d} "
+                  f"time {parallel_stats.elapsed:7.2f}s speedup {serial_time / parallel_stats.elapsed:5.2f}x"
+                  f"{'' if same else '  MISMATCH'}")
+
+
+def bench_ga(args):
+    """Generations/sec of the array-backed GA at several population sizes."""
+    import numpy as np
+    from genetic import evolve
+    from vectorized import partial_shape_points
+
+    board = random_board(args.fill, args.seed)
+    board_position, points = partial_shape_points(board, PLAYER2_COLOR)
+    rng = np.random.default_rng(args.seed)
+    for population_size in args.populations:
+        generations = args.generations
+        seconds = timeit.timeit(lambda: evolve(points, population_size, generations, rng=rng, stop_at_best=False),
+                                number=1)
+        print(f"population {population_size:6d}: {generations / seconds:10.0f} generations/sec")
+
+    # The list-based geneticAlgo for reference (fixed population of 10, stops at the best cell)
+    seconds = timeit.timeit(lambda: rules.geneticAlgo(board, PLAYER2_COLOR, PLAYER1_COLOR, len(points)),
+                            number=args.number)
+    array_seconds = timeit.timeit(lambda: evolve(points, rng=rng), number=args.number)
+    report('geneticAlgo (lists, with scoring)', seconds, args.number)
+    report('evolve (arrays, population 10)', array_seconds, args.number)
+
+
+def bench_islands(args):
+    """Generations and ms until the best cell is found: one population vs. the island model."""
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from genetic import evolve, island_evolve
+    from vectorized import partial_shape_points
+
+    def measure(search, points):
+        start = time.perf_counter()
+        best, generations = search(points)
+        return generations, (time.perf_counter() - start) * 1000, points[best] == max(points)
+
+    def summarize(name, runs):
+        found = sum(run[2] for run in runs)
+        generations = 'n/a' if runs[0][0] is None else f"{sum(run[0] for run in runs) / len(runs):.1f}"
+        print(f"{name:<28} {generations:>7} generations "
+              f"{sum(run[1] for run in runs) / len(runs):8.2f} ms  optimum found {found}/{len(runs)}")
+
+    random.seed(args.seed)
+    with ProcessPoolExecutor(max_workers=args.islands) as executor:
+        island_evolve([1.0, 2.0], args.islands, executor=executor)  # warm the pool up
+        for size in args.sizes:
+            boards = [random_board(args.fill, args.seed + trial, size) for trial in range(args.number)]
+            scored = [partial_shape_points(board, PLAYER2_COLOR) for board in boards]
+            print(f"{size}x{size} board, {args.number} positions:")
+            summarize('single population (arrays)',
+                      [measure(lambda points: evolve(points, generations=args.generations), points)
+                       for _, points in scored])
+            summarize(f'{args.islands} islands, migrate every {args.migration_interval}',
+                      [measure(lambda points: island_evolve(points, args.islands, args.migration_interval,
+                                                            generations=args.generations, executor=executor),
+                               points)
+                       for _, points in scored])
+            if size == BOARD_SIZE:
+                # geneticAlgo does not expose its generation count; report time and hit rate
+                runs = []
+                for board, (board_position, points) in zip(boards, scored):
+                    start = time.perf_counter()
+                    row, col = rules.geneticAlgo(board, PLAYER2_COLOR, PLAYER1_COLOR, len(points))
+                    runs.append((None, (time.perf_counter() - start) * 1000,
+                                 points[board_position.index([row, col])] == max(points)))
+                summarize('geneticAlgo (lists)', runs)
+
+
+def bench_frames(args):
+    """Frame time of the game screen on the dummy video driver: full redraw vs. dirty rects."""
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Offscreen: no display needed
+    import pygame
+    import interface
+    import textcache
+
+    pygame.init()
+    screen = pygame.display.set_mode((interface.WINDOW_WIDTH, interface.WINDOW_HEIGHT))
+    stop_rect = (0, interface.SCREEN_SIZE + 60, interface.SCREEN_SIZE // 2, interface.BUTTON_HEIGHT)
+    restart_rect = (interface.SCREEN_SIZE // 2, interface.SCREEN_SIZE + 60, interface.SCREEN_SIZE // 2,
+                    interface.BUTTON_HEIGHT)
+    rng = random.Random(args.seed)
+    cells = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+
+    def play(board):
+        """Put one more stone on the board, starting over once it is full."""
+        empty = [(row, col) for row, col in cells if board[row][col] is None]
+        if not empty:
+            for line in board:
+                line[:] = [None] * BOARD_SIZE
+            return
+        row, col = rng.choice(empty)
+        board[row][col] = rng.choice((PLAYER1_COLOR, PLAYER2_COLOR))
+
+    def full_frame(board):
+        # What main() did every frame before the renderer
+        screen.fill(interface.WHITE)
+        interface.draw_board(screen, board)
+        interface.draw_button(screen, 'Stop', *stop_rect)
+        interface.draw_button(screen, 'Restart', *restart_rect)
+        interface.draw_shapes(screen, interface.draw_info(screen, PLAYER1_COLOR, 0, 0))
+        pygame.display.flip()
+
+    renderer = interface.Renderer(screen, [('Stop', stop_rect), ('Restart', restart_rect)])
+    for name, frame, moving in (('full redraw, idle', full_frame, False),
+                                ('full redraw, one move/frame', full_frame, True),
+                                ('dirty rects, idle', None, False),
+                                ('dirty rects, one move/frame', None, True)):
+        board = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        renderer.invalidate()
+
+        def step():
+            if moving:
+                play(board)
+            if frame is not None:
+                frame(board)
+            else:
+                renderer.draw(board, PLAYER1_COLOR, 0, 0)
+
+        step()  # The renderer's first frame is a full paint
+        report(name, timeit.timeit(step, number=args.number), args.number)
+    textcache.clear()
+    pygame.quit()
+
+
+def bench_idle(args):
+    """CPU used by the GUI while it waits for the human: main() on the dummy driver for --seconds."""
+    import os
+    import time
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import level
+    import main
+
+    pygame.init()
+    # Pick a level, release the button, then leave the game idle on the player's turn until QUIT
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=level.button1.rect.center, button=1))
+    pygame.time.set_timer(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(0, 0), button=1), 100, 1)
+    pygame.time.set_timer(pygame.event.Event(pygame.QUIT), int(args.seconds * 1000), 1)
+    start, cpu = time.perf_counter(), time.process_time()
+    main.main()
+    wall, cpu = time.perf_counter() - start, time.process_time() - cpu
+    print(f"idle game screen: {cpu:.2f}s CPU in {wall:.2f}s = {cpu / wall * 100:.1f}% of one core")
+
+
+def bench_soak(args):
+    """Cycle the GUI scenes headlessly and check that memory and stack depth stay flat."""
+    import gc
+    import inspect
+    import os
+    import time
+    import tracemalloc
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import level
+    import main
+    import textcache
+
+    pygame.init()
+    screen = pygame.display.set_mode((main.WINDOW_WIDTH, main.WINDOW_HEIGHT))
+    cells = [(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)]
+    depths = [None, None]  # Smallest and largest stack depth seen at scene entry
+    samples = []
+    games = [0]
+
+    def click(pos):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+    def on_enter(scene, scenes):
+        """Queue the input each scene needs to move on: menu -> release -> play -> results -> ..."""
+        depth = len(inspect.stack(0))
+        depths[:] = [min(depth, depths[0] or depth), max(depth, depths[1] or depth)]
+        if scenes.transitions >= args.transitions:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        elif scene == 'menu':
+            click(level.button1.rect.center)
+        elif scene == 'release':
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(0, 0), button=1))
+        elif scene == 'play':
+            # Finish the game straight through the engine, then wake the scene up
+            for row, col in cells:
+                if scenes.game.game_over:
+                    break
+                scenes.game.play(row, col)
+            games[0] += 1
+            pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0), rel=(0, 0), buttons=(0, 0, 0)))
+        elif scene == 'results':
+            # Alternate between Restart and Menu
+            click((350, 325) if games[0] % 2 else (570, 325))
+        if scenes.transitions % 1000 == 0:
+            gc.collect()
+            samples.append((scenes.transitions, tracemalloc.get_traced_memory()[0]))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    scenes = main.Scenes(screen, on_enter)
+    scenes.run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    textcache.clear()
+    pygame.quit()
+
+    print(f"{scenes.transitions} transitions, {games[0]} games in {elapsed:.1f}s")
+    print(f"stack depth at scene entry: min {depths[0]}, max {depths[1]}")
+    for transitions, memory in samples:
+        print(f"  after {transitions:>6} transitions: {memory / 1024:8.1f} KiB traced")
+
+
+def bench_startup(args):
+    """Import cost of the GUI entry point and the headless engine, in fresh interpreters (-X importtime)."""
+    import os
+    import statistics
+    import subprocess
+    import sys
+    import time
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy')
+    probe = "import sys; import {0}; print('pygame' in sys.modules, 'numpy' in sys.modules)"
+    for module in ('main', 'engine', 'rules'):
+        cumulative = []
+        walls = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe.format(module)],
+                                    cwd=here, env=env, capture_output=True, text=True, check=True)
+            walls.append(time.perf_counter() - start)
+            # "import time: self [us] | cumulative | imported package"; top-level lines have no indent
+            for line in result.stderr.splitlines():
+                fields = line.split('|')
+                if len(fields) == 3 and fields[2].rstrip() == ' ' + module:
+                    cumulative.append(int(fields[1]))
+        pygame_loaded, numpy_loaded = result.stdout.splitlines()[-1].split()  # After pygame's banner
+        print(f"import {module:<7} {statistics.median(cumulative) / 1000:7.1f} ms import, "
+              f"{statistics.median(walls) * 1000:7.1f} ms process  "
+              f"(pygame loaded: {pygame_loaded}, numpy loaded: {numpy_loaded})")
+
+
+def bench_logging(args):
+    """Per-turn cost of the AI's logging at each level, to a text stream and to the buffered JSON sink.
+
+    The GA's own run time drifts by more than the logging costs, so the
+    overhead is computed as records per turn times the measured cost of one
+    record; whole-turn times (best of args.runs) are printed alongside.
+    """
+    import os
+    import tempfile
+    import time
+    import logs
+
+    board = random_board(args.fill, args.seed)
+    empty = sum(cell is None for line in board for cell in line)
+    rules.fuzzyLogic(board, PLAYER2_COLOR, PLAYER1_COLOR, empty, 0)  # Compile the fuzzy surface outside the timings
+    log = logs.get_logger('bench')
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        path = os.path.join(directory, 'log.jsonl')
+        sinks = {'text': {'stream': devnull}, 'json': {'stream': None, 'json_path': path}}
+
+        def per_record(level, options):
+            logs.configure(level, **options)
+            seconds = timeit.timeit(lambda: log.log(logs.TRACE, "%s %s", [3, 4], 1.25), number=10000)
+            logs.configure('warning', stream=None)  # Flushes the JSON buffer; counted in the time
+            return seconds / 10000
+
+        skipped = per_record('warning', sinks['text'])
+        emitted = {sink: per_record('trace', options) for sink, options in sinks.items()}
+        print(f"disabled call {skipped * 1e6:6.2f} us; record: " +
+              ", ".join(f"{sink} {seconds * 1e6:.2f} us" for sink, seconds in emitted.items()))
+
+        for level in ('warning', 'info', 'debug', 'trace'):
+            turns = []
+            for sink, options in sinks.items():
+                for _ in range(args.runs):
+                    logs.configure(level, **options)
+                    random.seed(args.seed)  # Same GA runs at every level
+                    start = time.perf_counter()
+                    for _ in range(args.number):
+                        rules.fuzzyLogic(board, PLAYER2_COLOR, PLAYER1_COLOR, empty, 0)
+                    logs.configure('warning', stream=None)
+                    turns.append((time.perf_counter() - start) / args.number)
+            logs.configure(level, stream=None, json_path=path)
+            random.seed(args.seed)
+            for _ in range(args.number):
+                rules.fuzzyLogic(board, PLAYER2_COLOR, PLAYER1_COLOR, empty, 0)
+            logs.configure('warning', stream=None)
+            with open(path) as records:
+                per_turn = sum(1 for _ in records) / args.number
+            print(f"{level:<8} {per_turn:6.1f} records/turn, overhead " +
+                  ", ".join(f"{sink} {per_turn * seconds * 1e6:7.1f} us" for sink, seconds in emitted.items()) +
+                  f"  (turn {min(turns) * 1e6:7.1f} us)")
+    logs.configure()
+
+
+BENCHMARKS = {
+    'scoring': bench_scoring,
+    'partial': bench_partial,
+    'search': bench_search,
+    'ordering': bench_ordering,
+    'parallel': bench_parallel,
+    'ga': bench_ga,
+    'islands': bench_islands,
+    'frames': bench_frames,
+    'idle': bench_idle,
+    'soak': bench_soak,
+    'startup': bench_startup,
+    'logging': bench_logging,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the scoring, AI and rendering code.")
+    parser.add_argument('name', choices=sorted(BENCHMARKS), help="benchmark to run")
+    parser.add_argument('--number', type=int, default=200, help="repetitions per measurement")
+    parser.add_argument('--fill', type=float, default=0.5, help="fraction of occupied cells")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the board")
+    parser.add_argument('--depth', type=int, default=3, help="search depth (maximum depth with --time-limit)")
+    parser.add_argument('--time-limit', type=float, default=None, help="search time budget in seconds")
+    parser.add_argument('--table-size', type=int, default=0, help="transposition table slots (0 = no table)")
+    parser.add_argument('--symmetric', action='store_true', help="fold board symmetries into the table key")
+    parser.add_argument('--top-k', type=int, default=None, help="also try capping every node to the K best moves")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="process counts to try")
+    parser.add_argument('--banked', type=int, nargs=2, default=[WIN_POINTS - 4, WIN_POINTS - 6],
+                        metavar=('MOVER', 'OPPONENT'), help="mid-game points for the parallel parity check")
+    parser.add_argument('--populations', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help="GA population sizes to try")
+    parser.add_argument('--generations', type=int, default=200, help="GA generations per measurement")
+    parser.add_argument('--islands', type=int, default=4, help="GA islands (worker processes)")
+    parser.add_argument('--migration-interval', type=int, default=10, help="generations between migrations")
+    parser.add_argument('--seconds', type=float, default=5.0, help="how long to leave the GUI idle")
+    parser.add_argument('--transitions', type=int, default=10000, help="scene changes for the soak")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per module for startup, repeats per level for logging")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100], help="board sizes to try")
+    args = parser.parse_args(argv)
+    BENCHMARKS[args.name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+import shapes
+from shapes import COMPILED_SHAPES, SHAPES
+
+# Cell (row, col) is bit row * size + col of a player's mask.
+
+
+def cell_bit(row, col, size=BOARD_SIZE):
+    return 1 << (row * size + col)
+
+
+def build_shape_masks(shapes=SHAPES, size=BOARD_SIZE):
+    """Precompute a mask for every anchor of every shape.
+
+    SHAPE_MASKS[name][anchor] is (mask, complete) where mask holds the shape's
+    cells that fall on the board and complete tells whether all of them do.
+    """
+    shape_masks = {}
+    for shape_name, (coords, base_points) in shapes.items():
+        anchors = []
+        for row in range(size):
+            for col in range(size):
+                mask = 0
+                inside = 0
+                for dr, dc in coords:
+                    if 0 <= row + dr < size and 0 <= col + dc < size:
+                        mask |= 1 << ((row + dr) * size + col + dc)
+                        inside += 1
+                anchors.append((mask, inside == len(coords)))
+        shape_masks[shape_name] = anchors
+    return shape_masks
+
+
+SHAPE_MASKS = build_shape_masks()
+_shape_masks = {BOARD_SIZE: SHAPE_MASKS}
+_shape_masks_version = shapes.catalog_version
+
+
+def shape_masks(size):
+    """SHAPE_MASKS for a size x size board, built on first use and again after shapes.load_catalog."""
+    global _shape_masks_version
+    if _shape_masks_version != shapes.catalog_version:
+        _shape_masks.clear()
+        _shape_masks_version = shapes.catalog_version
+    if size not in _shape_masks:
+        _shape_masks[size] = build_shape_masks(SHAPES, size)
+    return _shape_masks[size]
+
+
+class BitBoard:
+    """Board backend holding one integer bitmask per player."""
+
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.masks = {PLAYER1_COLOR: 0, PLAYER2_COLOR: 0}
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a BitBoard from the list-of-lists board used by the game."""
+        bitboard = cls(len(board))
+        for row in range(bitboard.size):
+            for col in range(bitboard.size):
+                if board[row][col] is not None:
+                    bitboard.set(row, col, board[row][col])
+        return bitboard
+
+    def to_board(self):
+        return [[self.get(row, col) for col in range(self.size)] for row in range(self.size)]
+
+    def get(self, row, col):
+        bit = cell_bit(row, col, self.size)
+        for player_color, mask in self.masks.items():
+            if mask & bit:
+                return player_color
+        return None
+
+    def set(self, row, col, player_color):
+        self.masks[player_color] |= cell_bit(row, col, self.size)
+
+    def clear(self, row, col):
+        bit = ~cell_bit(row, col, self.size)
+        for player_color in self.masks:
+            self.masks[player_color] &= bit
+
+    def occupied(self):
+        return self.masks[PLAYER1_COLOR] | self.masks[PLAYER2_COLOR]
+
+    def copy(self):
+        bitboard = BitBoard(self.size)
+        bitboard.masks = dict(self.masks)
+        return bitboard
+
+
+def is_shape_complete(bitboard, row, col, shape_name, player_color):
+    """Check if the shape anchored at (row, col) is fully on the board and owned by player_color."""
+    mask, complete = shape_masks(bitboard.size)[shape_name][row * bitboard.size + col]
+    return complete and bitboard.masks[player_color] & mask == mask
+
+
+def calculate_shape_completion(bitboard, row, col, shape_name, player_color):
+    """Percentage of the shape anchored at (row, col) already owned by player_color."""
+    mask, complete = shape_masks(bitboard.size)[shape_name][row * bitboard.size + col]
+    return ((bitboard.masks[player_color] & mask).bit_count() / len(SHAPES[shape_name][0])) * 100
+
+
+def check_shapes(bitboard, row, col, player_color):
+    """Bitboard version of rules.check_shapes: points for a move at (row, col)."""
+    points = 0
+    owned = bitboard.masks[player_color]
+    size = bitboard.size
+    masks = shape_masks(size)
+
+    for shape in COMPILED_SHAPES:
+        completed = False
+        for variant_name, coords in shape.variants:
+            anchors = masks[variant_name]
+            for dr, dc in coords:
+                start_row = row - dr
+                start_col = col - dc
+
+                if 0 <= start_row < size and 0 <= start_col < size:
+                    mask, complete = anchors[start_row * size + start_col]
+                    if complete and owned & mask == mask:
+                        completed = True
+                        break  # No need to check other positions for the same shape
+            if completed:
+                break  # Nor other orientations: a shape scores at most once per move
+        if completed:
+            points += shape.points
+
+    return points
+
+
+def check_partial_shapes(bitboard, row, col, player_color):
+    """Bitboard version of rules.check_partial_shapes."""
+    points = 0
+    owned = bitboard.masks[player_color]
+    size = bitboard.size
+    masks = shape_masks(size)
+
+    for shape_name, (coords, base_points) in SHAPES.items():
+        anchors = masks[shape_name]
+        for dr, dc in coords:
+            start_row = row - dr
+            start_col = col - dc
+
+            if 0 <= start_row < size and 0 <= start_col < size:
+                mask, complete = anchors[start_row * size + start_col]
+                completion_percentage = ((owned & mask).bit_count() / len(coords)) * 100
+                points += (completion_percentage / 100) * base_points
+
+    return points
@@ -0,0 +1,18 @@
+# Game rules shared by the engine, the AI and the interface (no pygame here)
+BOARD_SIZE = 10
+WIN_POINTS = 50  # A player above this score ends the game
+
+PLAYER1_COLOR = (255, 0, 0)  # Red
+PLAYER2_COLOR = (0, 0, 255)  # Blue
+
+# Declarative shape catalog, compiled once by shapes.py. cells is the drawn
+# orientation; with rotations/reflections set, every distinct rotated or
+# mirrored copy also scores. Completing a shape earns points * multiplier.
+SHAPE_CATALOG = {
+    'L*1:': {'cells': [(0, 0), (1, 0), (2, 0), (2, 1)], 'points': 4, 'multiplier': 1,
+             'rotations': False, 'reflections': False},
+    'Box*2:': {'cells': [(0, 0), (0, 1), (1, 0), (1, 1)], 'points': 4, 'multiplier': 2,
+               'rotations': False, 'reflections': False},
+    'T*3:': {'cells': [(0, 1), (1, 0), (1, 1), (1, 2), (2, 1)], 'points': 5, 'multiplier': 3,
+             'rotations': False, 'reflections': False},
+}
@@ -0,0 +1,121 @@
+import threading
+from constants import BOARD_SIZE, WIN_POINTS, PLAYER1_COLOR, PLAYER2_COLOR
+from incremental import IncrementalScorer
+from rules import check_shapes, fuzzyLogic, toggle_player
+
+
+class Game:
+    """Headless game state: board, turns, scores and end conditions (no pygame)."""
+
+    def __init__(self, size=BOARD_SIZE, book=None):
+        self.size = size
+        self.book = book  # opening.OpeningBook consulted by the AI, or None
+        self.scorer = IncrementalScorer(size)
+        self.resets = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new game with an empty board and Player 1 to move."""
+        self.board = [[None for _ in range(self.size)] for _ in range(self.size)]
+        self.current_player = PLAYER1_COLOR
+        self.player1_points = 0
+        self.player2_points = 0
+        self.empty = self.size * self.size
+        self.scorer.reset()
+        self.moves = 0
+        self.history = []  # (row, col, points scored) per move, for records.GameRecord
+        self.game_over = False
+        self.winner = None
+        self.resets += 1
+
+    def token(self):
+        """Identifies the current position; changes with every move and every reset."""
+        return self.resets, self.moves
+
+    def is_empty(self, row, col):
+        return self.board[row][col] is None
+
+    def play(self, row, col):
+        """Place the current player's color at (row, col), score it and pass the turn."""
+        player_color = self.current_player
+        self.board[row][col] = player_color
+        self.scorer.place(row, col, player_color)
+        self.empty -= 1
+        self.moves += 1
+        points = check_shapes(self.board, row, col, player_color)
+        self.history.append((row, col, points))
+        if player_color == PLAYER1_COLOR:
+            self.player1_points += points
+        else:
+            self.player2_points += points
+        self.current_player = toggle_player(player_color)
+        self.check_game_over()
+        return points
+
+    def ai_move(self):
+        """Let the fuzzy/genetic AI pick a move for the current player."""
+        player_color = self.current_player
+        return fuzzyLogic(self.board, player_color, toggle_player(player_color), self.empty,
+                          abs(self.player1_points - self.player2_points), self.scorer, book=self.book)
+
+    def ai_move_async(self):
+        """Start computing the AI move on a background thread; see BackgroundMove."""
+        return BackgroundMove(self)
+
+    def check_game_over(self):
+        """The game ends when the board is full or a player is above WIN_POINTS."""
+        if not self.empty or self.player1_points > WIN_POINTS or self.player2_points > WIN_POINTS:
+            self.game_over = True
+            self.winner = (PLAYER1_COLOR if self.player1_points > self.player2_points else
+                           PLAYER2_COLOR if self.player2_points > self.player1_points else None)
+        return self.game_over
+
+    def winner_points(self):
+        if self.winner == PLAYER1_COLOR:
+            return self.player1_points
+        if self.winner == PLAYER2_COLOR:
+            return self.player2_points
+        return None
+
+
+class BackgroundMove:
+    """One AI move computed on a daemon thread from a snapshot of the game.
+
+    The thread works on copies of the board and scorer, so the caller can keep
+    drawing, reset or quit meanwhile. A result whose token no longer matches
+    the game (after a reset) is stale and must be dropped. cancel() also
+    tells the GA to stop evolving, so a stale move stops using the CPU.
+    """
+
+    def __init__(self, game):
+        self.token = game.token()
+        self.move = None
+        self.error = None
+        self.cancelled = threading.Event()
+        player_color = game.current_player
+        args = ([line[:] for line in game.board], player_color, toggle_player(player_color), game.empty,
+                abs(game.player1_points - game.player2_points), game.scorer.copy(), None, game.book,
+                self.cancelled)
+        self.thread = threading.Thread(target=self._run, args=args, daemon=True)
+        self.thread.start()
+
+    def _run(self, *args):
+        try:
+            self.move = fuzzyLogic(*args)
+        except Exception as error:  # Reported to the caller through result()
+            self.error = error
+
+    def done(self):
+        return not self.thread.is_alive()
+
+    def cancel(self):
+        """Drop the result and stop the thread's GA at its next generation."""
+        self.cancelled.set()
+
+    def result(self, game):
+        """The computed move, or None if it is not ready, was cancelled or is stale for game."""
+        if self.cancelled.is_set() or not self.done() or self.token != game.token():
+            return None
+        if self.error is not None:
+            raise self.error
+        return self.move
@@ -0,0 +1,91 @@
+# Fuzzy controller behind rules.fuzzyLogic, defined as data and compiled into a lookup surface.
+
+# Trapezoids (a, b, c, d): membership rises from a to b, is 1 from b to c and falls to 0 at d.
+# Inputs are clamped to [0, 100] first, so the outer sets cover everything past the ends.
+BOARD_STATE = {  # Percentage of the board still empty
+    'full': (0, 0, 30, 35),
+    'medium': (30, 35, 70, 75),
+    'empty': (70, 75, 100, 100),
+}
+POINT_DIFF = {  # Score difference between the players
+    'low': (0, 0, 15, 20),
+    'medium': (15, 20, 30, 35),
+    'high': (30, 35, 100, 100),
+}
+
+# (board state, point difference) -> move mode
+RULES = [
+    ('empty', 'low', 'offensive'),
+    ('empty', 'high', 'offensive'),
+    ('medium', 'low', 'offensive'),
+    ('medium', 'high', 'offensive'),
+    ('full', 'low', 'offensive'),
+    ('full', 'high', 'offensive'),
+    ('empty', 'medium', 'deffensive'),
+    ('medium', 'medium', 'deffensive'),
+    ('full', 'medium', 'deffensive'),
+]
+
+# Sample points of each output set, and the largest centroid that still plays offensively
+OUTPUT = {
+    'offensive': (0, 10, 20),
+    'deffensive': (30, 40, 50),
+}
+OFFENSIVE_LIMIT = 20
+
+DOMAIN = 100  # Both inputs range over 0..DOMAIN; the surface has one entry per integer
+
+
+def membership(value, trapezoid):
+    a, b, c, d = trapezoid
+    value = min(max(value, 0), DOMAIN)
+    if b <= value <= c:
+        return 1
+    if a < value < b:
+        return (value - a) / (b - a)
+    if c < value < d:
+        return (d - value) / (d - c)
+    return 0
+
+
+def fuzzify(value, sets):
+    return {name: membership(value, shape) for name, shape in sets.items()}
+
+
+def centroid(empty_percent, points, board_state=None, point_diff=None):
+    """Fire every rule (min of its inputs, max per output) and defuzzify.
+
+    The weighting is the one fuzzyLogic has always used: the offensive sum
+    counts in full and only the defensive sum is divided by 3 * total.
+    """
+    board_state = board_state or fuzzify(empty_percent, BOARD_STATE)
+    point_diff = point_diff or fuzzify(points, POINT_DIFF)
+    move = {name: 0 for name in OUTPUT}
+    for state, diff, mode in RULES:
+        move[mode] = max(move[mode], min(board_state[state], point_diff[diff]))
+    total = move['offensive'] + move['deffensive']
+    if total == 0:
+        return sum(OUTPUT['deffensive']) / len(OUTPUT['deffensive'])  # No rule fired: defend
+    return sum(OUTPUT['offensive']) * move['offensive'] + sum(OUTPUT['deffensive']) * move['deffensive'] / (3 * total)
+
+
+def compile_surface():
+    """surface[empty_percent][points] is True where the controller plays offensively."""
+    point_diffs = [fuzzify(points, POINT_DIFF) for points in range(DOMAIN + 1)]
+    surface = []
+    for empty_percent in range(DOMAIN + 1):
+        board_state = fuzzify(empty_percent, BOARD_STATE)
+        surface.append([centroid(empty_percent, points, board_state, point_diff) <= OFFENSIVE_LIMIT
+                        for points, point_diff in enumerate(point_diffs)])
+    return surface
+
+
+_surface = None
+
+
+def offensive(empty_percent, points):
+    """True to extend our own shapes, False to block the opponent's; defined for any input."""
+    global _surface
+    if _surface is None:
+        _surface = compile_surface()  # Once, on the first AI move
+    return _surface[min(max(int(empty_percent + 0.5), 0), DOMAIN)][min(max(int(points + 0.5), 0), DOMAIN)]
@@ -0,0 +1,214 @@
+import atexit
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import profiling
+from vectorized import partial_shape_points
+
+
+def chromosome_width(cells):
+    """Bits needed to address `cells` candidate positions."""
+    return max(1, (cells - 1).bit_length())
+
+
+def evolve(points, population_size=10, generations=100, width=None, mutation_rate=0.5, rng=None,
+           stop_at_best=True, cancel=None):
+    """Search for the index of the highest value in points with a batched genetic algorithm.
+
+    The population is an integer array of chromosomes (cell indices). Each
+    generation does roulette selection, single-point crossover of neighbouring
+    pairs and a one-bit mutation of about mutation_rate of the population, as
+    whole-array operations. Chromosomes that land past the last cell are
+    redrawn. Stops early once the threading.Event `cancel` is set. Returns
+    (best_index, generations_used).
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    fitness_table = np.asarray(points, dtype=np.float64)
+    target = fitness_table.max() if stop_at_best else np.inf
+    population = rng.integers(0, len(fitness_table), population_size)
+    population, best, best_fitness, generation = run_generations(
+        fitness_table, population, generations - 1, width, mutation_rate, rng, target, cancel)
+    return best, generation + 1
+
+
+def run_generations(fitness_table, population, generations, width=None, mutation_rate=0.5, rng=None,
+                    target=np.inf, cancel=None):
+    """Evolve population for up to `generations` generations, stopping once target fitness is seen
+    or the threading.Event `cancel` is set.
+
+    Returns (population, best_index, best_fitness, generations_run).
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    cells = len(fitness_table)
+    width = width or chromosome_width(cells)
+    population_size = len(population)
+    # Pairs for crossover; an odd individual out is carried over unchanged
+    pairs = population_size - population_size % 2
+
+    fitness = fitness_table[population]
+    best = int(population[fitness.argmax()])
+    best_fitness = fitness.max()
+    generation = 0
+    while best_fitness < target and generation < generations:
+        if cancel is not None and cancel.is_set():
+            break
+        # Roulette selection (uniform when every chromosome scores 0)
+        total = fitness.sum()
+        if total > 0:
+            picks = np.searchsorted(np.cumsum(fitness), rng.random(population_size) * total, side='right')
+            population = population[np.minimum(picks, population_size - 1)]
+        else:
+            population = population[rng.integers(0, population_size, population_size)]
+
+        # Single-point crossover: swap the bits below the crosspoint within each pair
+        if pairs and width > 1:
+            low_bits = (1 << rng.integers(1, width, pairs // 2)) - 1
+            first, second = population[0:pairs:2], population[1:pairs:2]
+            swapped = (first ^ second) & low_bits
+            population[0:pairs:2] = first ^ swapped
+            population[1:pairs:2] = second ^ swapped
+
+        # Mutation: flip one random bit, then redraw anything past the last cell
+        mutate = rng.random(population_size) < mutation_rate
+        population[mutate] ^= 1 << rng.integers(0, width, int(mutate.sum()))
+        invalid = population >= cells
+        population[invalid] = rng.integers(0, cells, int(invalid.sum()))
+
+        generation += 1
+        fitness = fitness_table[population]
+        champion = fitness.argmax()
+        if fitness[champion] > best_fitness:
+            best_fitness = fitness[champion]
+            best = int(population[champion])
+    return population, best, best_fitness, generation
+
+
+_island_table = (None, None)  # Worker: (call, fitness table) of the island_evolve call it last served
+
+
+def _island_epoch(call, path, population, generations, width, mutation_rate, seed):
+    """Worker: evolve one island for one migration interval.
+
+    The fitness table is read from the file island_evolve wrote at `path` the
+    first time this worker serves the call, rather than pickled with every epoch.
+    """
+    global _island_table
+    if _island_table[0] != call:
+        _island_table = call, np.fromfile(path, dtype=np.float64)
+    fitness_table = _island_table[1]
+    return run_generations(fitness_table, population, generations, width, mutation_rate,
+                           np.random.default_rng(seed), fitness_table.max())
+
+
+_island_pool = None
+
+
+def island_pool():
+    """Process pool shared by every island_evolve call that is not given an executor; shut down at exit."""
+    global _island_pool
+    if _island_pool is None:
+        _island_pool = ProcessPoolExecutor()
+        atexit.register(_island_pool.shutdown, cancel_futures=True)
+    return _island_pool
+
+
+def island_evolve(points, islands=4, migration_interval=10, deadline=None, population_size=10,
+                  generations=100, migrants=2, width=None, mutation_rate=0.5, executor=None, cancel=None):
+    """Island-model GA: independent populations evolved in worker processes.
+
+    Every migration_interval generations each island sends copies of its
+    `migrants` fittest chromosomes to the next island in a ring, replacing its
+    weakest ones. Stops when an island finds the best cell, after `generations`
+    generations per island, once `deadline` seconds have passed, or once the
+    threading.Event `cancel` is set. Returns (best_index, generations_used).
+    """
+    executor = executor or island_pool()
+    start = time.perf_counter()
+    fitness_table = np.asarray(points, dtype=np.float64)
+    target = fitness_table.max()
+    rng = np.random.default_rng(random.getrandbits(64))
+    populations = [rng.integers(0, len(fitness_table), population_size) for _ in range(islands)]
+    best, best_fitness = 0, -np.inf
+    generation = 0
+    # Workers read the table once per call from this file (through the page cache)
+    call = int(rng.integers(1 << 63))
+    with tempfile.NamedTemporaryFile(suffix='.fitness', delete=False) as file:
+        fitness_table.tofile(file)
+    try:
+        while generation < generations:
+            epoch = min(migration_interval, generations - generation)
+            futures = [executor.submit(_island_epoch, call, file.name, population, epoch, width, mutation_rate,
+                                       int(rng.integers(1 << 63)))
+                       for population in populations]
+            results = [future.result() for future in futures]
+            generation += max(result[3] for result in results)
+            populations = [result[0] for result in results]
+            for population, island_best, island_fitness, _ in results:
+                if island_fitness > best_fitness:
+                    best, best_fitness = island_best, island_fitness
+            if best_fitness >= target or (deadline is not None and time.perf_counter() - start > deadline):
+                break
+            if cancel is not None and cancel.is_set():
+                break
+
+            # Ring migration: island i's fittest replace island i+1's weakest
+            elites = [population[np.argsort(fitness_table[population])[-migrants:]] for population in populations]
+            for index, population in enumerate(populations):
+                weakest = np.argsort(fitness_table[population])[:migrants]
+                population[weakest] = elites[index - 1]
+    finally:
+        os.unlink(file.name)
+    return best, generation
+
+
+def _candidates(board, player_color, scorer):
+    """(cells, points) from the scorer if there is one, else from a vectorized scan."""
+    profiler = profiling.active
+    if profiler is not None:
+        start = time.perf_counter()
+    if scorer is not None:
+        board_position, points = scorer.candidates(player_color)
+    else:
+        board_position, points = partial_shape_points(board, player_color)
+    if profiler is not None:
+        profiler.stage('scoring', start)
+        profiler.count('cells_scored', len(points))
+    return board_position, points
+
+
+def _profiled(evolve_function, *args, **kwargs):
+    """Run evolve or island_evolve, recording a 'ga' stage and its generations when profiling."""
+    profiler = profiling.active
+    if profiler is None:
+        return evolve_function(*args, **kwargs)
+    start = time.perf_counter()
+    best, generations = evolve_function(*args, **kwargs)
+    profiler.stage('ga', start)
+    profiler.count('ga_generations', generations)
+    return best, generations
+
+
+def geneticAlgoArray(board, player_color, opponent_color, length, scorer=None, population_size=10,
+                     generations=100, width=None, cancel=None):
+    """Drop-in for rules.geneticAlgo running the array-backed GA; returns [row, col]."""
+    board_position, points = _candidates(board, player_color, scorer)
+    if len(board_position) == 1:
+        return list(board_position[0])
+    best, _ = _profiled(evolve, points, population_size, generations, width, cancel=cancel)
+    return list(board_position[best])
+
+
+def geneticAlgoIslands(board, player_color, opponent_color, length, scorer=None, islands=4,
+                       migration_interval=10, deadline=0.5, population_size=10, generations=100, cancel=None):
+    """Drop-in for rules.geneticAlgo running island_evolve; returns [row, col]."""
+    board_position, points = _candidates(board, player_color, scorer)
+    if len(board_position) == 1:
+        return list(board_position[0])
+    best, _ = _profiled(island_evolve, points, islands, migration_interval, deadline, population_size, generations,
+                        cancel=cancel)
+    return list(board_position[best])
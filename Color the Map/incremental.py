@@ -0,0 +1,134 @@
+from bisect import bisect_left
+from heapq import heapify, heappop, heappush
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+from shapes import SHAPES
+
+
+class IncrementalScorer:
+    """Per-cell partial-shape potential for both colors, updated move by move.
+
+    potential[color][cell] is what rules.check_partial_shapes would return for
+    placing color on that (empty) cell. A move only changes the placements that
+    cover the played cell, so only the cells of those placements are rescored.
+    The candidate lists handed to the GA and a lazy max-heap per color are
+    patched in the same pass, so nothing is rebuilt over the whole board.
+    """
+
+    def __init__(self, size=BOARD_SIZE, shapes=SHAPES):
+        self.size = size
+        # Every placement whose anchor is on the board: (cells, base_points, total_cells)
+        self.placements = []
+        # cover[cell]: ids of the placements covering cell, in check_partial_shapes order
+        self.cover = [[] for _ in range(size * size)]
+        anchors = {}
+        for shape_name, (coords, base_points) in shapes.items():
+            for row in range(size):
+                for col in range(size):
+                    for dr, dc in coords:
+                        start_row = row - dr
+                        start_col = col - dc
+                        if 0 <= start_row < size and 0 <= start_col < size:
+                            key = (shape_name, start_row, start_col)
+                            if key not in anchors:
+                                anchors[key] = len(self.placements)
+                                cells = tuple(
+                                    (start_row + r) * size + start_col + c
+                                    for r, c in coords
+                                    if 0 <= start_row + r < size and 0 <= start_col + c < size
+                                )
+                                self.placements.append((cells, base_points, len(coords)))
+                            self.cover[row * size + col].append(anchors[key])
+        self.reset()
+
+    def reset(self):
+        """Forget all moves: every cell empty, every placement unowned."""
+        cells = self.size * self.size
+        self.counts = {color: [0] * len(self.placements) for color in (PLAYER1_COLOR, PLAYER2_COLOR)}
+        self.potential = {color: [self._score(cell, color) for cell in range(cells)]
+                          for color in (PLAYER1_COLOR, PLAYER2_COLOR)}
+        self.empty_cells = list(range(cells))
+        self.occupied = bytearray(cells)
+        self.positions = [divmod(cell, self.size) for cell in self.empty_cells]  # Tuples: safe to hand out
+        self.points = {color: potential[:] for color, potential in self.potential.items()}
+        # Entries go stale when a cell is taken or rescored; best() drops them as they surface
+        self.heaps = {color: [(-points, cell) for cell, points in enumerate(potential)]
+                      for color, potential in self.potential.items()}
+        for heap in self.heaps.values():
+            heapify(heap)
+
+    def copy(self):
+        """An independent scorer in the same state (the placement tables are shared)."""
+        scorer = IncrementalScorer.__new__(IncrementalScorer)
+        scorer.size = self.size
+        scorer.placements = self.placements
+        scorer.cover = self.cover
+        scorer.counts = {color: counts[:] for color, counts in self.counts.items()}
+        scorer.potential = {color: potential[:] for color, potential in self.potential.items()}
+        scorer.empty_cells = self.empty_cells[:]
+        scorer.occupied = self.occupied[:]
+        scorer.positions = self.positions[:]
+        scorer.points = {color: points[:] for color, points in self.points.items()}
+        scorer.heaps = {color: heap[:] for color, heap in self.heaps.items()}
+        return scorer
+
+    def _score(self, cell, color):
+        counts = self.counts[color]
+        points = 0
+        for placement in self.cover[cell]:
+            cells, base_points, total_cells = self.placements[placement]
+            # The scored cell is empty, so placing on it completes one more cell
+            completion_percentage = ((counts[placement] + 1) / total_cells) * 100
+            points += (completion_percentage / 100) * base_points
+        return points
+
+    def place(self, row, col, color):
+        """Record color on (row, col) and rescore only the cells that share a placement with it."""
+        cell = row * self.size + col
+        empty_cells = self.empty_cells
+        index = bisect_left(empty_cells, cell)
+        del empty_cells[index]
+        del self.positions[index]
+        for points in self.points.values():
+            del points[index]
+        self.occupied[cell] = 1
+        counts = self.counts[color]
+        affected = set()
+        for placement in self.cover[cell]:
+            counts[placement] += 1
+            affected.update(self.placements[placement][0])
+        potential = self.potential[color]
+        points = self.points[color]
+        heap = self.heaps[color]
+        for neighbour in affected:
+            value = potential[neighbour] = self._score(neighbour, color)
+            if not self.occupied[neighbour]:
+                points[bisect_left(empty_cells, neighbour)] = value
+                heappush(heap, (-value, neighbour))
+
+    def offensive(self, row, col, color):
+        """Partial-shape points color would reach by playing (row, col)."""
+        return self.potential[color][row * self.size + col]
+
+    def defensive(self, row, col, color):
+        """Partial-shape points color denies the opponent by playing (row, col)."""
+        opponent_color = PLAYER1_COLOR if color == PLAYER2_COLOR else PLAYER2_COLOR
+        return self.potential[opponent_color][row * self.size + col]
+
+    def candidates(self, color):
+        """(board_position, points) for every empty cell, as geneticAlgo builds them.
+
+        Copies of the lists place() keeps up to date (positions are (row, col)
+        tuples), so callers can change them without touching the scorer.
+        """
+        return self.positions[:], self.points[color][:]
+
+    def best(self, color):
+        """max(candidates(color)[1]) without scanning the board; None once the board is full."""
+        heap = self.heaps[color]
+        potential = self.potential[color]
+        while heap:
+            negative, cell = heap[0]
+            if not self.occupied[cell] and -negative == potential[cell]:
+                return -negative
+            heappop(heap)
+        return None
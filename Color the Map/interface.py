@@ -1,7 +1,9 @@
 import pygame
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+from shapes import COMPILED_SHAPES
+from textcache import render_text
 
 # Define constants
-BOARD_SIZE = 10
 TILE_SIZE = 50
 SCREEN_SIZE = BOARD_SIZE * TILE_SIZE
 BUTTON_HEIGHT = 50
@@ -11,76 +13,101 @@ WINDOW_HEIGHT = SCREEN_SIZE + BUTTON_HEIGHT + 60   # Increased height to fit the
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
-PLAYER1_COLOR = (255, 0, 0)  # Red
-PLAYER2_COLOR = (0, 0, 255)  # Blue
 BUTTON_COLOR = (0, 51, 51)
 BUTTON_HOVER_COLOR = (0, 255, 128)
 BUTTON_TEXT_COLOR = (255, 255, 255)
 BUTTON_BORDER_COLOR = (0, 0, 0)  # Color for button borders
 SHAPE_DISPLAY_TILE_SIZE = 20  # Smaller size for shape display
-SHAPES = {
-    'L*1:': [[(0, 0), (1, 0), (2, 0), (2, 1)], 4],
-    'Box*2:': [[(0, 0), (0, 1), (1, 0), (1, 1)], 4],
-    'T*3:': [[(0, 1), (1, 0), (1, 1), (1, 2), (2, 1)], 5]
-}
+FPS = 30  # Frame cap while something animates
+IDLE_TIMEOUT = 500  # Longest block in pygame.event.wait (ms) while nothing animates
+
+def wait_events(clock, animating):
+    """Events for the next frame.
+
+    While animating, caps the loop at FPS; otherwise sleeps in pygame.event.wait
+    until an event arrives (or IDLE_TIMEOUT passes) instead of spinning.
+    """
+    if animating:
+        clock.tick(FPS)
+        return pygame.event.get()
+    event = pygame.event.wait(IDLE_TIMEOUT)
+    clock.tick()
+    events = [] if event.type == pygame.NOEVENT else [event]
+    return events + pygame.event.get()
+
+def left_click(events):
+    """Position of the last left mouse click among events, or None."""
+    click = None
+    for event in events:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            click = event.pos
+    return click
+
+def draw_tile(surface, row, col, color, top=60):
+    """Draw one board cell; top is the y of the board on surface."""
+    rect = (col * TILE_SIZE, row * TILE_SIZE + top, TILE_SIZE, TILE_SIZE)
+    pygame.draw.rect(surface, WHITE if color is None else color, rect)
+    pygame.draw.rect(surface, BLACK, rect, 1)
+    return rect
 
 def draw_board(screen, board):
     """Draw the game board with the current state."""
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            color = WHITE if board[row][col] is None else board[row][col]
-            pygame.draw.rect(screen, color, (col * TILE_SIZE, row * TILE_SIZE + 60, TILE_SIZE, TILE_SIZE))  # Adjusted Y position
-            pygame.draw.rect(screen, BLACK, (col * TILE_SIZE, row * TILE_SIZE + 60, TILE_SIZE, TILE_SIZE), 1)  # Adjusted Y position
-
-def draw_button(screen, text, x, y, width, height):
-    """Draw a button and handle button click events."""
-    mouse = pygame.mouse.get_pos()
-    click = pygame.mouse.get_pressed()
-
-    # Draw button background
-    if x < mouse[0] < x + width and y < mouse[1] < y + height:
-        pygame.draw.rect(screen, BUTTON_HOVER_COLOR, (x, y, width, height))
-        if click[0] == 1:
-            return True
-    else:
-        pygame.draw.rect(screen, BUTTON_COLOR, (x, y, width, height))
-    
+    for row in range(len(board)):
+        for col in range(len(board)):
+            draw_tile(screen, row, col, board[row][col])  # Board starts 60px down, below the title
+
+def inside(pos, x, y, width, height):
+    return pos is not None and x < pos[0] < x + width and y < pos[1] < y + height
+
+def button_hovered(x, y, width, height):
+    return inside(pygame.mouse.get_pos(), x, y, width, height)
+
+def draw_button_face(screen, text, x, y, width, height, hovered):
+    """Draw a button in its normal or hover colors."""
+    pygame.draw.rect(screen, BUTTON_HOVER_COLOR if hovered else BUTTON_COLOR, (x, y, width, height))
+
     # Draw button border
     pygame.draw.rect(screen, BUTTON_BORDER_COLOR, (x, y, width, height), 2)  # Border around the button
 
     # Draw button text
-    font = pygame.font.Font(None, 36)
-    text_surface = font.render(text, True, BUTTON_TEXT_COLOR)
+    text_surface = render_text(text, 36, BUTTON_TEXT_COLOR)
     text_rect = text_surface.get_rect(center=(x + width // 2, y + height // 2))
     screen.blit(text_surface, text_rect)
+
+def draw_button(screen, text, x, y, width, height, click=None):
+    """Draw a button; True if click (this frame's left-click position, see left_click) hit it."""
+    draw_button_face(screen, text, x, y, width, height, button_hovered(x, y, width, height))
+    return inside(click, x, y, width, height)
+
+def draw_player_info(screen, current_player, player1_points, player2_points):
+    """Draw whose turn it is and both scores; returns the y below them."""
+    player_info_x = SCREEN_SIZE + 10
+    y_offset = 60  # Starting Y position for the player info section, moved down for board
+    
+    info_text = f"Current Player: {'Player' if current_player == PLAYER1_COLOR else 'AI'}\n"
+    info_text += f"Player: {player1_points}\nAI: {player2_points}\n"
     
-    return False
+    for line in info_text.split('\n'):
+        text_surface = render_text(line, 36, BLACK)  # Re-rendered only when a score changes
+        screen.blit(text_surface, (player_info_x, y_offset))
+        y_offset += 40
+    return y_offset
 
 def draw_info(screen, current_player, player1_points, player2_points):
     """Draw the game title and player information."""
-    font = pygame.font.Font(None, 36)
-    
     # Draw the game title above the board
     title_text = "Color Board Game"
-    title_surface = font.render(title_text, True, BLACK)
+    title_surface = render_text(title_text, 36, BLACK)
     title_rect = title_surface.get_rect(center=(SCREEN_SIZE // 2, 30))  # Centered above the board
     screen.blit(title_surface, title_rect)
     
     # Draw player turn information
     player_info_x = SCREEN_SIZE + 10
-    y_offset = 60  # Starting Y position for the player info section, moved down for board
-    
-    info_text = f"Current Player: {'Player' if current_player == PLAYER1_COLOR else 'AI'}\n"
-    info_text += f"Player: {player1_points}\nAI: {player2_points}\n"
-    
-    for line in info_text.split('\n'):
-        text_surface = font.render(line, True, BLACK)
-        screen.blit(text_surface, (player_info_x, y_offset))
-        y_offset += 40
+    y_offset = draw_player_info(screen, current_player, player1_points, player2_points)
     
     # Draw "Allowed Shapes" title
     shapes_title_text = "Allowed Shapes"
-    shapes_title_surface = font.render(shapes_title_text, True, BLACK)
+    shapes_title_surface = render_text(shapes_title_text, 36, BLACK)
     shapes_title_rect = shapes_title_surface.get_rect(topleft=(player_info_x, y_offset + 10))
     screen.blit(shapes_title_surface, shapes_title_rect)
     y_offset += 50  # Move below the "Allowed Shapes" title
@@ -89,18 +116,135 @@ def draw_info(screen, current_player, player1_points, player2_points):
 
 def draw_shapes(screen, y_offset):
     """Draw the allowed shapes and their representation."""
-    font = pygame.font.Font(None, 28)  # Smaller font size for shape names
     shape_offset_x = SCREEN_SIZE + 10
     
-    for shape_name, (coords, base_points) in SHAPES.items():
+    for shape in COMPILED_SHAPES:
         # Draw shape name
-        shape_text = font.render(shape_name, True, BLACK)
+        shape_text = render_text(shape.name, 28, BLACK)  # Smaller font size for shape names
         screen.blit(shape_text, (shape_offset_x, y_offset))
         
-        # Draw shape
-        for dr, dc in coords:
+        # Draw shape (its declared orientation)
+        for dr, dc in shape.cells:
             pygame.draw.rect(screen, BLACK, (shape_offset_x + 70 + dc * SHAPE_DISPLAY_TILE_SIZE, y_offset + dr * SHAPE_DISPLAY_TILE_SIZE, SHAPE_DISPLAY_TILE_SIZE, SHAPE_DISPLAY_TILE_SIZE), 1)
         
         y_offset += 30  # Space between shape name and shape
         y_offset += SHAPE_DISPLAY_TILE_SIZE * 2  # Space for the shape itself
         y_offset += 20  # Space between different shapes
+
+def show_endgame_popup(screen, winner, player1_points, player2_points):
+    """Show the endgame popup with the result of the game."""
+    pygame.font.init()
+
+    # Define the message text
+    if winner == PLAYER1_COLOR:
+        lines = [
+            "Player Wins!",
+            f"Points: {player1_points}"
+        ]
+    elif winner == PLAYER2_COLOR:
+        lines = [
+            "AI Wins!",
+            f"Points: {player2_points}"
+        ]
+    else:
+        lines = [
+            "It's a Tie!",
+            f"Player Points: {player1_points}",
+            f"AI Points: {player2_points}"
+        ]
+
+    # Render the message text
+    screen.fill((255, 255, 255))  # White background
+
+    text_surfaces = [render_text(line, 48, (0, 0, 0)) for line in lines]
+    total_height = sum(surf.get_height() for surf in text_surfaces)
+    start_y = (screen.get_height() // 2) - (total_height // 2)
+
+    for text_surface in text_surfaces:
+        text_rect = text_surface.get_rect(center=(screen.get_width() // 2, start_y))
+        screen.blit(text_surface, text_rect)
+        start_y += text_surface.get_height() + 10  # Space between lines
+
+    pygame.display.flip()
+
+    # Wait for a bit to show the message
+    pygame.time.wait(2000)  # Wait for 2 seconds
+
+def draw_thinking(screen):
+    """Draw an animated "AI thinking" note above the player info while the AI move is computed."""
+    dots = '.' * (pygame.time.get_ticks() // 400 % 4)
+    text_surface = render_text(f"AI thinking{dots}", 36, PLAYER2_COLOR)
+    screen.blit(text_surface, (SCREEN_SIZE + 10, 20))
+
+INFO_RECT = pygame.Rect(SCREEN_SIZE, 0, INFO_WIDTH, 220)  # Turn, scores and the "AI thinking" note
+
+
+class Renderer:
+    """Dirty-rectangle renderer for the game screen.
+
+    The board is kept drawn on its own surface and the renderer remembers what
+    the window shows. A frame repaints only the tiles whose color changed, the
+    info lines when the turn, a score or the thinking note changes, and a
+    button when its hover state flips, then pushes just those rects with
+    pygame.display.update. Call invalidate() after drawing over the window
+    (e.g. a popup) to repaint everything on the next frame.
+    """
+
+    def __init__(self, screen, buttons):
+        self.screen = screen
+        self.buttons = buttons  # [(text, (x, y, width, height))]
+        self.board_surface = pygame.Surface((SCREEN_SIZE, SCREEN_SIZE))
+        self.invalidate()
+
+    def invalidate(self):
+        self.shown_board = None
+        self.shown_info = None
+        self.shown_hover = [None] * len(self.buttons)
+
+    def draw(self, board, current_player, player1_points, player2_points, thinking=False):
+        """Bring the window up to date; returns the rects that were pushed to the display."""
+        screen = self.screen
+        full = self.shown_board is None
+        dirty = []
+        if full:
+            screen.fill(WHITE)
+            draw_shapes(screen, draw_info(screen, current_player, player1_points, player2_points))
+            self.shown_board = [[None] * len(board) for _ in board]
+            for row in range(len(board)):
+                for col in range(len(board)):
+                    draw_tile(self.board_surface, row, col, board[row][col], 0)
+                    self.shown_board[row][col] = board[row][col]
+            screen.blit(self.board_surface, (0, 60))
+        else:
+            for row, line in enumerate(board):
+                shown = self.shown_board[row]
+                for col, color in enumerate(line):
+                    if shown[col] != color:
+                        shown[col] = color
+                        tile = pygame.Rect(draw_tile(self.board_surface, row, col, color, 0))
+                        screen.blit(self.board_surface, tile.move(0, 60), tile)
+                        dirty.append(tile.move(0, 60))
+
+        dots = pygame.time.get_ticks() // 400 % 4 if thinking else None
+        info = (current_player, player1_points, player2_points, dots)
+        if info != self.shown_info:
+            self.shown_info = info
+            screen.fill(WHITE, INFO_RECT)
+            draw_player_info(screen, current_player, player1_points, player2_points)
+            if thinking:
+                draw_thinking(screen)
+            dirty.append(INFO_RECT)
+
+        for index, (text, rect) in enumerate(self.buttons):
+            hovered = button_hovered(*rect)
+            if hovered != self.shown_hover[index]:
+                self.shown_hover[index] = hovered
+                draw_button_face(screen, text, *rect, hovered)
+                dirty.append(pygame.Rect(rect))
+
+        if full:
+            pygame.display.flip()
+            return [screen.get_rect()]
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
@@ -1,12 +1,13 @@
 import pygame
-import sys
+import logs
+import textcache
+from textcache import render_text
+from interface import wait_events
 
-# Initialize Pygame
-pygame.init()
+log = logs.get_logger('level')
 
-# Set up the display
-screen = pygame.display.set_mode((800, 600))
-pygame.display.set_caption("Level Selection")
+# Nothing is initialized at import: the caller owns pygame.init() and the display
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -14,10 +15,10 @@ BLACK = (0, 0, 0)
 BUTTON_COLOR = (70, 130, 180)
 HOVER_COLOR = (100, 149, 237)
 
-# Define fonts
-title_font = pygame.font.Font(None, 74)
-subtitle_font = pygame.font.Font(None, 50)
-button_font = pygame.font.Font(None, 60)
+# Define font sizes
+TITLE_FONT_SIZE = 74
+SUBTITLE_FONT_SIZE = 50
+BUTTON_FONT_SIZE = 60
 
 # Button class
 class Button:
@@ -34,7 +35,7 @@ class Button:
         else:
             pygame.draw.rect(screen, self.color, self.rect)
 
-        text_surface = button_font.render(self.text, True, WHITE)
+        text_surface = render_text(self.text, BUTTON_FONT_SIZE, WHITE)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -48,7 +49,7 @@ class Button:
 button_width = 300
 button_height = 100
 button_spacing = 50
-center_x = screen.get_width() // 2
+center_x = SCREEN_WIDTH // 2
 button_x = center_x - button_width // 2
 
 title_y = 50
@@ -62,28 +63,30 @@ button1 = Button("Easy", button_x, button1_y, button_width, button_height, BUTTO
 button2 = Button("Hard", button_x, button2_y, button_width, button_height, BUTTON_COLOR, HOVER_COLOR)
 
 def run_level_selection(screen):
+    clock = pygame.time.Clock()
     running = True
     while running:
         screen.fill(WHITE)
-        for event in pygame.event.get():
+        # Nothing animates here: sleep until an event (or the idle timeout) instead of spinning
+        for event in wait_events(clock, False):
             if event.type == pygame.QUIT:
                 running = False
                 return None  # Ensure proper exit
 
             if button1.is_clicked(event):
-                print("Easy Level Selected")
+                log.info("Easy level selected")
                 return 'easy'
 
             if button2.is_clicked(event):
-                print("Hard Level Selected")
+                log.info("Hard level selected")
                 return 'hard'
 
         # Draw title and subtitle
-        title_surface = title_font.render("Game: Color the Map", True, BLACK)
+        title_surface = render_text("Game: Color the Map", TITLE_FONT_SIZE, BLACK)
         title_rect = title_surface.get_rect(center=(center_x, title_y))
         screen.blit(title_surface, title_rect)
 
-        subtitle_surface = subtitle_font.render("Click the level to start the game", True, BLACK)
+        subtitle_surface = render_text("Click the level to start the game", SUBTITLE_FONT_SIZE, BLACK)
         subtitle_rect = subtitle_surface.get_rect(center=(center_x, subtitle_y))
         screen.blit(subtitle_surface, subtitle_rect)
 
@@ -92,9 +95,12 @@ def run_level_selection(screen):
         button2.draw(screen)
 
         pygame.display.flip()
+    textcache.clear()
     pygame.quit()
 
 if __name__ == "__main__":
-    screen = pygame.display.set_mode((800, 600))
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Level Selection")
     level = run_level_selection(screen)
     print("Level chosen:", level)
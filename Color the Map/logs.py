@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import sys
+
+# Diagnostics go through the standard logging module under the 'colormap' logger.
+# Messages take %-style arguments, so nothing is formatted unless a handler will
+# emit the record. Nothing is configured at import: until configure() is called
+# only warnings reach stderr (logging's last-resort handler).
+ROOT = 'colormap'
+TRACE = 5  # Below DEBUG: the GA's per-candidate dump, about a hundred records per AI turn
+logging.addLevelName(TRACE, 'TRACE')
+
+LEVELS = {
+    'trace': TRACE,
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+LEVEL_ENV = 'COLOR_THE_MAP_LOG'  # Default level for configure(), e.g. COLOR_THE_MAP_LOG=debug
+JSON_BUFFER = 1024  # Records held in memory before the JSON sink writes them out
+
+
+def get_logger(name):
+    """The logger for one module of the game, e.g. get_logger('rules')."""
+    return logging.getLogger(f'{ROOT}.{name}')
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger and the formatted message."""
+
+    def format(self, record):
+        return json.dumps({'time': record.created, 'level': record.levelname,
+                           'logger': record.name, 'message': record.getMessage()})
+
+
+def configure(level=None, stream=sys.stderr, json_path=None, buffer=JSON_BUFFER):
+    """(Re)configure the game's logging and return its root logger.
+
+    level is a name from LEVELS or a number, defaulting to $COLOR_THE_MAP_LOG
+    or 'warning'. Records go to stream as text unless stream is None, and to
+    json_path as JSON lines if given; the JSON sink is buffered, writing every
+    `buffer` records, on any warning, and at exit.
+    """
+    logger = logging.getLogger(ROOT)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        target = getattr(handler, 'target', None)
+        handler.close()  # A MemoryHandler flushes into its target here
+        if target is not None:
+            target.close()
+    level = level or os.environ.get(LEVEL_ENV, 'warning')
+    logger.setLevel(LEVELS[level.lower()] if isinstance(level, str) else level)
+    logger.propagate = False
+    if stream is not None:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(name)s: %(message)s'))
+        logger.addHandler(handler)
+    if json_path is not None:
+        from logging.handlers import MemoryHandler  # Pulls in socket and more; only this sink needs it
+        target = logging.FileHandler(json_path, 'w')
+        target.setFormatter(JsonFormatter())
+        logger.addHandler(MemoryHandler(buffer, logging.WARNING, target))
+    return logger
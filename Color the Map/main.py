@@ -1,11 +1,12 @@
 import pygame
-import sys
-from interface import draw_board, draw_button, draw_info, draw_shapes, PLAYER1_COLOR, PLAYER2_COLOR, WHITE, BLACK, BOARD_SIZE, TILE_SIZE, SCREEN_SIZE, BUTTON_HEIGHT, INFO_WIDTH, WINDOW_WIDTH, WINDOW_HEIGHT
-from rules import check_shapes, show_endgame_popup, best_move_for_ai, fuzzyLogic, geneticAlgo
+import logs
+from interface import Renderer, inside, left_click, wait_events, PLAYER1_COLOR, PLAYER2_COLOR, WHITE, TILE_SIZE, SCREEN_SIZE, BUTTON_HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT
+from engine import Game
 from level import run_level_selection
+import textcache
+from textcache import render_text
 
-# Initialize Pygame
-pygame.init()
+log = logs.get_logger('main')
 
 class Button:
     def __init__(self, text, x, y, width, height, color, hover_color):
@@ -21,8 +22,7 @@ class Button:
         else:
             pygame.draw.rect(screen, self.color, self.rect)
 
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = render_text(self.text, 36, WHITE)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -33,7 +33,6 @@ class Button:
         return False
 
 def show_score_popup(screen, winner, points):
-    font = pygame.font.Font(None, 48)
     background = pygame.Surface(screen.get_size())
     # background.set_alpha(128)  # Semi-transparent overlay
     background.fill((255, 255, 255))  # White background
@@ -45,10 +44,12 @@ def show_score_popup(screen, winner, points):
         win = "Player"
     elif winner == PLAYER2_COLOR:
         win = "AI"                    
+    else:
+        win = "Nobody"  # A tie: both players have `points`
     winner_text = f"{win} won!"
     points_text = f"Points: {points}"
-    winner_surface = font.render(winner_text, True, (0, 0, 0))
-    points_surface = font.render(points_text, True, (0, 0, 0))
+    winner_surface = render_text(winner_text, 48, (0, 0, 0))
+    points_surface = render_text(points_text, 48, (0, 0, 0))
     screen.blit(winner_surface, (300, 200))
     screen.blit(points_surface, (300, 250))
 
@@ -60,12 +61,12 @@ def show_score_popup(screen, winner, points):
 
     # Event loop for the pop-up
     # flag = -1
+    clock = pygame.time.Clock()
     running = True
     while running:
-        for event in pygame.event.get():
+        for event in wait_events(clock, False):
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                return None  # The caller shuts pygame down
 
             if restart_button.is_clicked(event):
                 running = False
@@ -91,113 +92,139 @@ def show_score_popup(screen, winner, points):
 
 
 def wait_for_new_click():
-    """Wait for the user to release the mouse button and click anew, preventing accidental game actions."""
+    """Wait for the user to release the mouse button and click anew, preventing accidental game actions.
+
+    Returns False if the window was closed meanwhile.
+    """
     pygame.event.clear(pygame.MOUSEBUTTONDOWN)  # Clear existing mouse down events
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.MOUSEBUTTONUP:  # Wait for mouse to be released
-                return
+        event = pygame.event.wait()  # Sleeps until the next event
+        if event.type == pygame.MOUSEBUTTONUP:  # Wait for mouse to be released
+            return True
+        if event.type == pygame.QUIT:
+            return False
+
+
+class Scenes:
+    """The game's screens as a state machine: menu -> release -> play -> results -> ...
+
+    Each scene method runs until the user leaves it and returns the name of the
+    next scene, or None to quit. run() loops over them, so going back to the
+    menu never grows the call stack, and one Game is reset in place for the
+    whole session. on_enter(name, scenes), if given, is called before each
+    scene (bench.py's soak drives the scenes through it).
+    """
+
+    def __init__(self, screen, on_enter=None):
+        self.screen = screen
+        self.on_enter = on_enter
+        self.game = Game()
+        self.ai_turn = None  # BackgroundMove while the AI is thinking
+        self.clock = pygame.time.Clock()
+        self.stop_rect = (0, SCREEN_SIZE + 60, SCREEN_SIZE // 2, BUTTON_HEIGHT)
+        self.restart_rect = (SCREEN_SIZE // 2, SCREEN_SIZE + 60, SCREEN_SIZE // 2, BUTTON_HEIGHT)
+        self.renderer = Renderer(screen, [('Stop', self.stop_rect), ('Restart', self.restart_rect)])
+        self.transitions = 0
+
+    def run(self, scene='menu'):
+        while scene is not None:
+            if self.on_enter is not None:
+                self.on_enter(scene, self)
+            scene = getattr(self, scene)()
+            self.transitions += 1
+        self.cancel_ai()
+
+    def cancel_ai(self):
+        if self.ai_turn is not None:
+            self.ai_turn.cancel()  # Its move belongs to the old game
+            self.ai_turn = None
+
+    def menu(self):
+        # Run level selection
+        chosen_level = run_level_selection(self.screen)
+        if chosen_level is None:
+            return None  # If no level is chosen, exit
+        self.game.reset()
+        return 'release'
+
+    def release(self):
+        # Wait for new click to prevent accidental actions
+        if wait_for_new_click() is False:
+            return None
+        return 'play'
+
+    def play(self):
+        game = self.game
+        renderer = self.renderer
+        renderer.invalidate()  # Menus and popups have painted over the window
+
+        while True:
+            # Animate (frame-capped) while the AI moves; otherwise sleep until the human does something
+            ai_to_move = not game.game_over and game.current_player != PLAYER1_COLOR
+            events = wait_events(self.clock, ai_to_move or self.ai_turn is not None)
+            if any(event.type == pygame.QUIT for event in events):
+                return None
+
+            click = left_click(events)
+            if inside(click, *self.stop_rect):
+                return None
+
+            if inside(click, *self.restart_rect):
+                self.cancel_ai()
+                game.reset()
+                continue
+
+            if not game.game_over:
+                if game.current_player == PLAYER1_COLOR:
+                    if click is not None:
+                        x, y = click
+                        if y >= 60 and y < SCREEN_SIZE + 60 and x < SCREEN_SIZE:
+                            col = x // TILE_SIZE
+                            row = (y - 60) // TILE_SIZE
+                            if game.is_empty(row, col):
+                                game.play(row, col)
+                                log.debug("Player-> %s", game.empty)
+                else:
+                    # The AI move runs on a worker thread so the window keeps drawing and handling events
+                    if self.ai_turn is None:
+                        self.ai_turn = game.ai_move_async()
+                    elif self.ai_turn.done():
+                        move = self.ai_turn.result(game)
+                        self.ai_turn = None
+                        if move:
+                            row, col = move
+                            game.play(row, col)
+                            log.debug("AI-> %s", game.empty)
+
+            if game.game_over:
+                log.debug("Game over with %s empty cells: %s", game.empty, game.board)
+                return 'results'
+
+            # Repaint only what changed since the last frame
+            renderer.draw(game.board, game.current_player, game.player1_points, game.player2_points,
+                          self.ai_turn is not None)
+
+    def results(self):
+        game = self.game
+        # show_endgame_popup(screen, game.winner, game.player1_points, game.player2_points)
+        points = game.player1_points if game.winner is None else game.winner_points()
+        flag = show_score_popup(self.screen, game.winner, points)
+        log.debug("Score popup returned %s", flag)
+        if flag == 1:
+            game.reset()
+            return 'release'
+        if flag == 0:
+            return 'menu'
+        return None
 
 
 def main():
+    logs.configure()  # Level from $COLOR_THE_MAP_LOG, warnings only by default
+    pygame.init()  # Here rather than at import, so importing main has no side effects
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption('Color Board Game')
-
-    # Run level selection
-    chosen_level = run_level_selection(screen)
-    if chosen_level is None:
-        return  # If no level is chosen, exit
-    
-    # Wait for new click to prevent accidental actions
-    wait_for_new_click()
-
-    # Setup the game based on chosen level
-    current_player = PLAYER1_COLOR
-    running = True
-    game_over = False
-    board = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-    player1_points = 0
-    player2_points = 0
-    empty = 100
-
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-        screen.fill((255, 255, 255))  # White background
-        draw_board(screen, board)
-        stop_clicked = draw_button(screen, 'Stop', 0, SCREEN_SIZE + 60, SCREEN_SIZE // 2, BUTTON_HEIGHT)
-        restart_clicked = draw_button(screen, 'Restart', SCREEN_SIZE // 2, SCREEN_SIZE + 60, SCREEN_SIZE // 2, BUTTON_HEIGHT)
-
-        
-        if stop_clicked:
-            running = False
-
-        if restart_clicked:
-            board[:] = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-            current_player = PLAYER1_COLOR
-            player1_points = 0
-            player2_points = 0
-            empty = 100
-            game_over = False
-            continue
-
-
-        if not game_over:
-            if current_player == PLAYER1_COLOR:
-                if pygame.mouse.get_pressed()[0]:
-                    x, y = pygame.mouse.get_pos()
-                    if y >= 60 and y < SCREEN_SIZE + 60 and x < SCREEN_SIZE:
-                        col = x // TILE_SIZE
-                        row = (y - 60) // TILE_SIZE
-                        if board[row][col] is None:
-                            board[row][col] = current_player
-                            empty -= 1
-                            points = check_shapes(board, row, col, current_player)
-                            player1_points += points
-                            current_player = PLAYER2_COLOR
-                            print("Player->", empty)
-            else:
-                move = fuzzyLogic(board, PLAYER2_COLOR, PLAYER1_COLOR, empty, abs(player1_points-player2_points))
-                if move:
-                    row, col = move
-                    board[row][col] = PLAYER2_COLOR
-                    empty -= 1
-                    points = check_shapes(board, row, col, PLAYER2_COLOR)
-                    player2_points += points
-                    current_player = PLAYER1_COLOR
-                    print("AI->", empty)
-
-            if not empty or player1_points > 50 or player2_points > 50:
-                print(empty)
-                print(board)
-                game_over = True
-                winner = PLAYER1_COLOR if player1_points > player2_points else PLAYER2_COLOR if player2_points > player1_points else None
-                # show_endgame_popup(screen, winner, player1_points, player2_points)
-                winPoints = player1_points if winner == PLAYER1_COLOR else player2_points if winner == PLAYER2_COLOR else None
-                flag = show_score_popup(screen, winner, winPoints)
-                print (flag)
-
-                if flag == 1:
-                    wait_for_new_click()
-                    board[:] = [[None for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-                    current_player = PLAYER1_COLOR
-                    player1_points = 0
-                    player2_points = 0
-                    empty = 100
-                    game_over = False
-                    continue
-
-                elif flag == 0:
-                    main()
-                    
-        # Draw info and shapes
-        y_offset = draw_info(screen, current_player, player1_points, player2_points)
-        draw_shapes(screen, y_offset)
-
-        pygame.display.flip()
-
+    Scenes(screen).run()
+    textcache.clear()  # Its fonts and surfaces die with pygame
     pygame.quit()
 
 if __name__ == "__main__":
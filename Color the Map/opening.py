@@ -0,0 +1,160 @@
+import argparse
+import mmap
+import struct
+import sys
+import time
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+from ordering import MoveOrderer
+from records import catalog_hash, read_records
+from rules import SearchStats, best_move_for_ai
+from transposition import ZobristHasher
+
+# An opening book file is a header followed by an open-addressed hash table:
+#   header  '<4sBH8sQHI': magic, version, board size, shape catalog hash, Zobrist seed,
+#           plies covered (positions with fewer stones than this), slot count
+#   slots   '<QHBBf': canonical key (0 = empty slot), canonical cell, search depth,
+#           search width (the top_k kept at every node, 0 = every move), score
+# Readers map the file instead of loading it, so worker processes share one copy
+# through the page cache.
+MAGIC = b'CTMB'
+VERSION = 2
+HEADER = struct.Struct('<4sBH8sQHI')
+ENTRY = struct.Struct('<QHBBf')
+ZOBRIST_SEED = 0x5EED  # ZobristHasher's default; stored so readers hash the same way
+BOOK_PLIES = 8
+BOOK_DEPTH = 3
+BOOK_TOP_K = 8
+
+
+class OpeningBook:
+    """Read-only, memory-mapped table of early positions and the move a deep search chose for each.
+
+    Positions are keyed by ZobristHasher with symmetric=True (the side to move
+    included), so positions equivalent under a symmetry of the shape catalog
+    share an entry. With the current catalog catalog_symmetries() keeps only
+    the identity, so no positions are folded together: the key is the plain
+    Zobrist hash. lookup() hashes into locals and keeps no per-call state, so
+    one book can serve several threads (e.g. BackgroundMove); only the
+    hits/misses tallies may undercount.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, catalog, seed, plies, slots = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        if catalog != catalog_hash():
+            raise ValueError(f"{path} was built for another shape catalog")
+        self.size = size
+        self.plies = plies
+        self.slots = slots
+        self.hasher = ZobristHasher(size, symmetric=True, seed=seed)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, board, player_color, stones=None):
+        """(row, col, score, depth, width) stored for board with player_color to move, or None.
+
+        stones is the number of occupied cells if the caller knows it; boards
+        past the plies the book covers are rejected without hashing.
+        """
+        size = self.size
+        if len(board) != size:
+            return None
+        if stones is None:
+            stones = sum(cell is not None for line in board for cell in line)
+        if stones >= self.plies:
+            return None
+        key, symmetry = self.hasher.board_key(board, player_color)
+        key = key or 1  # 0 marks an empty slot
+        slot = key % self.slots
+        while True:
+            entry_key, cell, depth, width, score = ENTRY.unpack_from(self.data, HEADER.size + slot * ENTRY.size)
+            if entry_key == key:
+                self.hits += 1
+                row, col = self.hasher.from_canonical(divmod(cell, size), symmetry)
+                return row, col, score, depth, width
+            if entry_key == 0:
+                self.misses += 1
+                return None
+            slot = (slot + 1) % self.slots
+
+    def __len__(self):
+        return sum(1 for slot in range(self.slots)
+                   if ENTRY.unpack_from(self.data, HEADER.size + slot * ENTRY.size)[0])
+
+    def close(self):
+        self.data.close()
+
+
+def build(records, plies=BOOK_PLIES, depth=BOOK_DEPTH, top_k=BOOK_TOP_K, size=BOARD_SIZE):
+    """Search every distinct position before the first `plies` moves of the recorded games.
+
+    top_k=None searches every move at every node; otherwise the top_k best
+    survive, and entries record that width so deeper-but-narrower searches are
+    not mistaken for full-width ones. Returns {canonical key: (canonical cell,
+    depth, width, score)}.
+    """
+    hasher = ZobristHasher(size, symmetric=True, seed=ZOBRIST_SEED)
+    entries = {}
+    for record in records:
+        if record.size != size:
+            continue
+        board = [[None] * size for _ in range(size)]
+        player_color = PLAYER1_COLOR
+        points = {PLAYER1_COLOR: 0, PLAYER2_COLOR: 0}
+        for cell, delta in zip(record.cells[:plies], record.deltas):
+            hasher.set_board(board)
+            key, symmetry = hasher.key(player_color)
+            key = key or 1
+            if key not in entries:
+                stats = SearchStats()
+                opponent_color = PLAYER2_COLOR if player_color == PLAYER1_COLOR else PLAYER1_COLOR
+                row, col = best_move_for_ai(board, player_color, depth, stats=stats, orderer=MoveOrderer(top_k=top_k),
+                                            banked=(points[player_color], points[opponent_color]))
+                canonical = hasher.to_canonical((row, col), symmetry)
+                entries[key] = (canonical[0] * size + canonical[1], stats.depth, top_k or 0, stats.score)
+            row, col = divmod(cell, size)
+            board[row][col] = player_color
+            points[player_color] += delta
+            player_color = PLAYER2_COLOR if player_color == PLAYER1_COLOR else PLAYER1_COLOR
+    return entries
+
+
+def write_book(path, entries, plies=BOOK_PLIES, size=BOARD_SIZE):
+    """Write entries from build() as a book file with the table at most half full."""
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+    data = bytearray(HEADER.size + slots * ENTRY.size)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, size, catalog_hash(), ZOBRIST_SEED, plies, slots)
+    for key, (cell, depth, width, score) in entries.items():
+        slot = key % slots
+        while ENTRY.unpack_from(data, HEADER.size + slot * ENTRY.size)[0]:
+            slot = (slot + 1) % slots
+        ENTRY.pack_into(data, HEADER.size + slot * ENTRY.size, key, cell, depth, width, score)
+    with open(path, 'wb') as file:
+        file.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build an opening book from recorded games (e.g. tournament.py --record).")
+    parser.add_argument('book', help="book file to write")
+    parser.add_argument('records', nargs='+', help="game record files whose openings to search")
+    parser.add_argument('--plies', type=int, default=BOOK_PLIES, help="moves into each game to cover")
+    parser.add_argument('--depth', type=int, default=BOOK_DEPTH, help="search depth for every book move")
+    parser.add_argument('--top-k', type=int, default=BOOK_TOP_K,
+                        help="moves kept at every search node (0: all; only such books answer full-width searches)")
+    args = parser.parse_args(argv)
+
+    records = [record for path in args.records for record in read_records(path)]
+    start = time.perf_counter()
+    entries = build(records, args.plies, args.depth, args.top_k or None)
+    write_book(args.book, entries, args.plies)
+    print(f"{len(entries)} positions from {len(records)} games in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+from ordering import MoveOrderer
+import rules
+
+COLORS = (None, PLAYER1_COLOR, PLAYER2_COLOR)  # Cell codes used by pack_board
+
+
+def pack_board(board):
+    """Serialize a board to one byte per cell (0 empty, 1 Player 1, 2 Player 2)."""
+    return bytes(COLORS.index(cell) for line in board for cell in line)
+
+
+def unpack_board(data, size):
+    return [[COLORS[data[row * size + col]] for col in range(size)] for row in range(size)]
+
+
+def _search_chunk(packed, size, player, depth, moves, time_left, ordering, banked):
+    """Worker: search a slice of the root moves, returning (move, score, nodes) or None on timeout."""
+    board = unpack_board(packed, size)
+    stats = rules.SearchStats(None if time_left is None else time.perf_counter() + time_left)
+    orderer = MoveOrderer(presort=False) if ordering else None
+    if orderer is not None:
+        orderer.start_iteration(depth)
+    try:
+        move, score = rules.search_root(board, COLORS[player], depth, moves, stats, None, orderer, banked)
+    except rules.SearchTimeout:
+        return None
+    return move, score, stats.nodes
+
+
+def search_root_parallel(executor, board, player_color, depth, moves, workers, time_left=None, ordering=False,
+                         banked=(0, 0)):
+    """Split the root moves over the pool and merge the results.
+
+    Each chunk returns its first move with the best score. The merge keeps the
+    best score and breaks ties by position in `moves`. That is the move the
+    serial search_root would pick, with the same score. banked is
+    (player_color's points, the opponent's points), as in rules.minimax.
+    Returns (move, score, nodes), or None if a chunk ran out of time.
+    """
+    packed = pack_board(board)
+    player = COLORS.index(player_color)
+    chunks = [moves[index::workers] for index in range(workers) if moves[index::workers]]
+    futures = [executor.submit(_search_chunk, packed, len(board), player, depth, chunk, time_left, ordering, banked)
+               for chunk in chunks]
+    done, pending = wait(futures, timeout=time_left)
+    for future in pending:
+        future.cancel()
+    if pending or any(future.result() is None for future in futures):
+        return None
+
+    order = {move: index for index, move in enumerate(moves)}
+    results = [future.result() for future in futures]
+    move, score, _ = max(results, key=lambda result: (result[1], -order[result[0]]))
+    return move, score, sum(result[2] for result in results)
+
+
+def parallel_best_move(board, player_color, depth=3, workers=None, time_limit=None, executor=None,
+                       stats=None, ordering=False, banked=(0, 0)):
+    """best_move_for_ai with the root moves spread over a process pool.
+
+    With time_limit, deepens from 0 up to `depth` and returns the deepest
+    iteration that finished in time, like best_move_for_ai. Pass an executor
+    to reuse a pool across moves; otherwise one is created for this call.
+    banked is (player_color's points, the opponent's points), as in best_move_for_ai.
+    """
+    workers = workers or os.cpu_count() or 1
+    if stats is None:
+        stats = rules.SearchStats()
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    start = time.perf_counter()
+    moves = rules.get_all_possible_moves(board, player_color)
+    best_move = None
+    try:
+        for current_depth in (range(depth + 1) if time_limit is not None else [depth]):
+            time_left = None
+            if time_limit is not None and current_depth > 0:  # Depth 0 always completes
+                time_left = start + time_limit - time.perf_counter()
+                if time_left <= 0:
+                    break
+            result = search_root_parallel(executor, board, player_color, current_depth, moves, workers,
+                                          time_left, ordering, banked)
+            if result is None:
+                break
+            best_move, stats.score, nodes = result
+            stats.nodes += nodes
+            stats.depth = current_depth
+            if time_limit is not None:
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+    stats.elapsed = time.perf_counter() - start
+    return best_move
@@ -0,0 +1,146 @@
+import argparse
+import json
+import time
+
+# Opt-in instrumentation of the AI pipeline. Instrumented code checks `profiling.active`
+# and does nothing else while it is None, so leaving it off costs one attribute lookup.
+active = None
+
+
+class Profiler:
+    """Wall time and call counts per stage, and counters, for every AI move.
+
+    A move is opened by the first instrumented entry point (fuzzyLogic,
+    best_move_for_ai) and closed when it returns; nested entry points add to
+    the open move. Stages closed outside a move are not recorded.
+    """
+
+    def __init__(self):
+        self.moves = []
+        self.current = None
+        self.depth = 0
+        self.origin = time.perf_counter()
+
+    def begin_move(self, label):
+        self.depth += 1
+        if self.depth == 1:
+            self.current = {'move': len(self.moves), 'label': label, 'start': time.perf_counter(),
+                            'stages': {}, 'counters': {}, 'spans': []}
+
+    def end_move(self):
+        self.depth -= 1
+        if self.depth == 0 and self.current is not None:
+            move = self.current
+            move['wall'] = time.perf_counter() - move['start']
+            self.moves.append(move)
+            self.current = None
+
+    def stage(self, name, start, span=True):
+        """Close stage `name` begun at start (a perf_counter() value).
+
+        span=False only adds to the totals; used for stages called thousands of
+        times per move, which would swamp a trace viewer.
+        """
+        end = time.perf_counter()
+        move = self.current
+        if move is None:
+            return
+        seconds, calls = move['stages'].get(name, (0.0, 0))
+        move['stages'][name] = (seconds + end - start, calls + 1)
+        if span:
+            move['spans'].append((name, start, end - start))
+
+    def count(self, name, amount=1):
+        move = self.current
+        if move is not None:
+            move['counters'][name] = move['counters'].get(name, 0) + amount
+
+    def records(self):
+        """One JSON-ready dict per move; times in seconds from when profiling was enabled."""
+        return [{
+            'move': move['move'],
+            'label': move['label'],
+            'start': move['start'] - self.origin,
+            'wall': move['wall'],
+            'stages': {name: {'seconds': seconds, 'calls': calls}
+                       for name, (seconds, calls) in move['stages'].items()},
+            'counters': move['counters'],
+        } for move in self.moves]
+
+    def write_jsonl(self, path):
+        with open(path, 'w') as trace:
+            for record in self.records():
+                trace.write(json.dumps(record) + '\n')
+
+    def write_chrome_trace(self, path):
+        """Complete ('X') events for every move and stage span; open in chrome://tracing or Perfetto."""
+        events = []
+        for move in self.moves:
+            events.append({'name': move['label'], 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': (move['start'] - self.origin) * 1e6, 'dur': move['wall'] * 1e6,
+                           'args': dict(move['counters'], move=move['move'])})
+            for name, start, seconds in move['spans']:
+                events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+                               'ts': (start - self.origin) * 1e6, 'dur': seconds * 1e6})
+        with open(path, 'w') as trace:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace)
+
+
+def enable():
+    """Start recording into a new Profiler and return it."""
+    global active
+    active = Profiler()
+    return active
+
+
+def disable():
+    """Stop recording; returns the Profiler that was active, if any."""
+    global active
+    profiler, active = active, None
+    return profiler
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(records):
+    """Print p50/p95/p99 per stage (ms per move) and per counter across the given move records."""
+    stages = {'move': [record['wall'] for record in records]}
+    calls = {}
+    counters = {}
+    for record in records:
+        for name, stage in record['stages'].items():
+            stages.setdefault(name, []).append(stage['seconds'])
+            calls.setdefault(name, []).append(stage['calls'])
+        for name, value in record['counters'].items():
+            counters.setdefault(name, []).append(value)
+
+    print(f"{len(records)} moves")
+    print(f"{'stage':<16} {'moves':>6} {'calls/move':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, values in stages.items():
+        per_move = sum(calls[name]) / len(calls[name]) if name in calls else 1
+        print(f"{name:<16} {len(values):>6} {per_move:>10.1f} {percentile(values, 0.5) * 1000:>9.3f} "
+              f"{percentile(values, 0.95) * 1000:>9.3f} {percentile(values, 0.99) * 1000:>9.3f}")
+    if counters:
+        print(f"{'counter':<16} {'moves':>6} {'mean':>10} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, values in counters.items():
+            print(f"{name:<16} {len(values):>6} {sum(values) / len(values):>10.1f} {percentile(values, 0.5):>9} "
+                  f"{percentile(values, 0.95):>9} {percentile(values, 0.99):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize AI profiling traces (JSON lines, e.g. from selfplay.py --profile).")
+    parser.add_argument('traces', nargs='+', help="JSON lines trace files")
+    args = parser.parse_args(argv)
+    records = []
+    for path in args.traces:
+        with open(path) as trace:
+            records.extend(json.loads(line) for line in trace if line.strip())
+    summarize(records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import time
+from array import array
+import shapes
+from constants import PLAYER1_COLOR, PLAYER2_COLOR, WIN_POINTS
+from rules import check_shapes, get_cell_index
+
+# A record file is a sequence of games, each laid out as:
+#   header  '<4sBH8sQH': magic, version, board size, shape catalog hash, seed, move count
+#   names   the two strategies, Player 1's first, each as a length byte and UTF-8
+#   cells   one unsigned byte per move (two on boards past 16x16): row * size + col
+#   deltas  one unsigned byte per move: the points that move scored
+MAGIC = b'CTMR'
+VERSION = 1
+HEADER = struct.Struct('<4sBH8sQH')
+MIN_REPLAY_RATE = 2000  # Games per second `check` insists on by default
+
+
+def catalog_hash(catalog=None):
+    """8-byte digest of a shape catalog (default: the one in use); games scored under different catalogs are not comparable."""
+    return hashlib.sha256(json.dumps(catalog or shapes.catalog, sort_keys=True).encode()).digest()[:8]
+
+
+def cell_typecode(size):
+    return 'B' if size * size <= 256 else 'H'
+
+
+class GameRecord:
+    """One finished game: board size, catalog, seed, strategies and every move with the points it scored."""
+
+    def __init__(self, size, seed, strategies, cells, deltas, catalog=None):
+        self.size = size
+        self.seed = seed
+        self.strategies = tuple(strategies)
+        self.cells = array(cell_typecode(size), cells)
+        self.deltas = bytes(deltas)
+        self.catalog = catalog or catalog_hash()
+
+    @classmethod
+    def from_game(cls, game, seed, strategies):
+        """Record a finished engine.Game; strategies are (Player 1's, Player 2's) names."""
+        return cls(game.size, seed, strategies, [row * game.size + col for row, col, _ in game.history],
+                   [points for _, _, points in game.history])
+
+    def moves(self):
+        """(row, col, points) per move."""
+        return [divmod(cell, self.size) + (delta,) for cell, delta in zip(self.cells, self.deltas)]
+
+    def encode(self):
+        names = b''.join(bytes([len(name)]) + name for name in (name.encode() for name in self.strategies))
+        return (HEADER.pack(MAGIC, VERSION, self.size, self.catalog, self.seed, len(self.deltas))
+                + names + self.cells.tobytes() + self.deltas)
+
+
+def decode(data, offset=0):
+    """(GameRecord, offset of the next record) for the record starting at data[offset]."""
+    magic, version, size, catalog, seed, count = HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} game record at byte {offset}")
+    offset += HEADER.size
+    strategies = []
+    for _ in range(2):
+        length = data[offset]
+        strategies.append(bytes(data[offset + 1:offset + 1 + length]).decode())
+        offset += 1 + length
+    cells = array(cell_typecode(size))
+    cells.frombytes(data[offset:offset + count * cells.itemsize])
+    offset += count * cells.itemsize
+    record = GameRecord(size, seed, strategies, cells, data[offset:offset + count], catalog)
+    return record, offset + count
+
+
+def read_records(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    records = []
+    offset = 0
+    while offset < len(data):
+        record, offset = decode(data, offset)
+        records.append(record)
+    return records
+
+
+def write_records(path, records, append=False):
+    with open(path, 'ab' if append else 'wb') as file:
+        for record in records:
+            file.write(record.encode())
+
+
+def replay(record):
+    """Re-score a record through check_shapes, without the engine or pygame.
+
+    Returns (Player 1's points, Player 2's points, index of the first move
+    that disagrees with the record, or None). A move disagrees if it scores
+    differently, lands on an occupied cell, or comes after the game was over;
+    a record that stops before the game is over disagrees at its length.
+    """
+    size = record.size
+    board = [[None] * size for _ in range(size)]
+    points = {PLAYER1_COLOR: 0, PLAYER2_COLOR: 0}
+    player_color = PLAYER1_COLOR
+    mismatch = None
+    for index, (cell, delta) in enumerate(zip(record.cells, record.deltas)):
+        row, col = divmod(cell, size)
+        if board[row][col] is not None or max(points.values()) > WIN_POINTS:
+            mismatch = index
+            break
+        board[row][col] = player_color
+        scored = check_shapes(board, row, col, player_color)
+        if scored != delta and mismatch is None:
+            mismatch = index
+        points[player_color] += scored
+        player_color = PLAYER2_COLOR if player_color == PLAYER1_COLOR else PLAYER1_COLOR
+    else:
+        if len(record.deltas) < size * size and max(points.values()) <= WIN_POINTS:
+            mismatch = len(record.deltas)
+    return points[PLAYER1_COLOR], points[PLAYER2_COLOR], mismatch
+
+
+def replay_strategies(record):
+    """Play the record's strategies again from its seed; index of the first differing move, or None."""
+    from tournament import play_match
+    replayed = play_match((0, record.strategies[0], record.strategies[1], record.seed))[-1]
+    for index, (cell, replayed_cell) in enumerate(zip(record.cells, replayed.cells)):
+        if cell != replayed_cell:
+            return index
+    if len(record.cells) != len(replayed.cells):
+        return min(len(record.cells), len(replayed.cells))
+    return None
+
+
+def check(records, min_rate=MIN_REPLAY_RATE, strategies=False):
+    """Replay a regression corpus and print what fails; True if every game still plays out as recorded."""
+    ok = True
+    current = catalog_hash()
+    stale = [index for index, record in enumerate(records) if record.catalog != current]
+    if stale:
+        print(f"{len(stale)} games were recorded with another shape catalog (first: game {stale[0]})")
+        ok = False
+
+    for size in {record.size for record in records}:
+        get_cell_index(size)  # Built on first use; keep it out of the replay rate
+    start = time.perf_counter()
+    results = [replay(record) for record in records]
+    elapsed = time.perf_counter() - start
+    rate = len(records) / elapsed if elapsed else float('inf')
+    for index, (_, _, mismatch) in enumerate(results):
+        if mismatch is not None:
+            print(f"game {index}: scoring differs from the record at move {mismatch}")
+            ok = False
+    moves = sum(len(record.deltas) for record in records)
+    print(f"replayed {len(records)} games ({moves} moves) in {elapsed:.3f}s: {rate:.0f} games/sec")
+    if rate < min_rate:
+        print(f"replay is slower than {min_rate:g} games/sec")
+        ok = False
+
+    if strategies:
+        for index, record in enumerate(records):
+            mismatch = replay_strategies(record)
+            if mismatch is not None:
+                print(f"game {index}: {' vs '.join(record.strategies)} (seed {record.seed}) "
+                      f"now plays differently from move {mismatch}")
+                ok = False
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay binary game records (written by tournament.py --record).")
+    parser.add_argument('records', nargs='+', help="game record files")
+    parser.add_argument('--min-rate', type=float, default=MIN_REPLAY_RATE,
+                        help="fail if replay runs below this many games/sec")
+    parser.add_argument('--strategies', action='store_true',
+                        help="also replay each game's strategies from its seed and compare the moves")
+    args = parser.parse_args(argv)
+    records = [record for path in args.records for record in read_records(path)]
+    return 0 if check(records, args.min_rate, args.strategies) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
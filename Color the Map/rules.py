@@ -1,115 +1,279 @@
 import math
 import random
-import pygame
-from interface import SHAPES, BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+import time
+import fuzzy
+import logs
+import profiling
+import shapes
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR, WIN_POINTS
+from shapes import COMPILED_SHAPES, SHAPES
+from transposition import EXACT, LOWER, UPPER
 #random.seed(42)
 
+log = logs.get_logger('rules')
 
-def minimax(board, depth, alpha, beta, maximizing_player, player_color):
-    
-    if depth == 0 or is_game_over(board):
-        return evaluate_board(board, player_color)
-
-    if maximizing_player:
-        max_eval = float('-inf')
-        for move in get_all_possible_moves(board, player_color):
-            eval = minimax(make_move(board, move, player_color), depth - 1, alpha, beta, False, toggle_player(player_color))
-            max_eval = max(max_eval, eval)
+
+PARTIAL_WEIGHT = 0.25  # Worth of partial-shape progress relative to banked points in the search
+
+_partial_shape_points = False  # Not looked up yet
+
+
+def get_partial_shape_points():
+    """vectorized.partial_shape_points, or None without numpy.
+
+    Imported on first use: numpy takes longer to import than the rest of the
+    engine, and the game's AI never needs it (it scores through IncrementalScorer).
+    """
+    global _partial_shape_points
+    if _partial_shape_points is False:
+        try:
+            from vectorized import partial_shape_points
+        except ImportError:  # numpy is optional; geneticAlgo falls back to scoring cell by cell
+            partial_shape_points = None
+        _partial_shape_points = partial_shape_points
+    return _partial_shape_points
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the iterative-deepening deadline has passed or the search was cancelled."""
+
+
+class SearchStats:
+    """Node counter and timing for one best_move_for_ai call."""
+
+    def __init__(self, deadline=None, cancel=None):
+        self.nodes = 0
+        self.depth = -1  # Deepest fully searched depth
+        self.score = None
+        self.elapsed = 0.0
+        self.deadline = deadline
+        self.cancel = cancel  # A threading.Event; once set, the search stops at the next check
+
+    def stopped(self):
+        """True once the deadline has passed or the search was cancelled."""
+        return ((self.deadline is not None and time.perf_counter() > self.deadline)
+                or (self.cancel is not None and self.cancel.is_set()))
+
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+def minimax(board, depth, alpha, beta, maximizing_player, player_color, score=0, stats=None, table=None,
+            orderer=None, banked=(0, 0)):
+    """Alpha-beta search with player_color to move.
+
+    The board is changed in place and restored before returning. score is the
+    evaluation of the current position for the maximizing player, kept up to
+    date move by move along the search path. With a TranspositionTable, its
+    hasher must match the board (best_move_for_ai calls table.new_search).
+    A MoveOrderer (ordering.py) sorts the moves and learns from cutoffs.
+    banked is (player_color's points, the opponent's points) so the search
+    stops where the engine would: on a full board or a player past WIN_POINTS.
+    Table entries are keyed on the board alone, so they are only probed and
+    stored where no line in the subtree can pass WIN_POINTS; nearer the
+    threshold the same board can end or go on depending on the points banked.
+    """
+    if stats is not None:
+        stats.nodes += 1
+        if stats.nodes % 1024 == 0 and stats.stopped():
+            raise SearchTimeout()
+
+    if depth == 0 or is_game_over(board, banked):
+        return score
+
+    moves = get_all_possible_moves(board, player_color)
+    # Table scores are what the subtree adds to score, from the mover's point of view
+    sign = 1 if maximizing_player else -1
+    hash_move = None
+    # A subtree of `depth` plies checks for game over after up to depth - 1 moves, depth // 2 by either side
+    cached = table is not None and max(banked) + depth // 2 * max_move_points() <= WIN_POINTS
+    if cached:
+        key, symmetry = table.hasher.key(player_color)
+        entry = table.probe(key)
+        if entry is not None:
+            _, entry_depth, entry_score, bound, entry_move, _ = entry
+            if entry_depth >= depth:
+                value = score + sign * entry_score
+                if bound == EXACT:
+                    return value
+                if (bound == LOWER) == maximizing_player:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+            if entry_move is not None:
+                hash_move = table.hasher.from_canonical(entry_move, symmetry)
+        alpha_orig, beta_orig = alpha, beta
+    if orderer is not None:
+        moves = orderer.order(board, moves, player_color, depth, hash_move)
+    elif hash_move is not None:
+        moves.remove(hash_move)
+        moves.insert(0, hash_move)
+
+    best_eval = float('-inf') if maximizing_player else float('inf')
+    best_move = None
+    for move in moves:
+        gain, points = move_value(board, move, player_color)
+        if table is not None:
+            table.hasher.toggle(move[0], move[1], player_color)
+        try:
+            eval = minimax(board, depth - 1, alpha, beta, not maximizing_player, toggle_player(player_color),
+                           score + sign * gain, stats, table, orderer, (banked[1], banked[0] + points))
+        finally:
+            undo_move(board, move)
+            if table is not None:
+                table.hasher.toggle(move[0], move[1], player_color)
+        if maximizing_player:
+            if eval > best_eval:
+                best_eval, best_move = eval, move
             alpha = max(alpha, eval)
-            if beta <= alpha:
-                break
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for move in get_all_possible_moves(board, toggle_player(player_color)):
-            eval = minimax(make_move(board, move, toggle_player(player_color)), depth - 1, alpha, beta, True, toggle_player(player_color))
-            min_eval = min(min_eval, eval)
+        else:
+            if eval < best_eval:
+                best_eval, best_move = eval, move
             beta = min(beta, eval)
-            if beta <= alpha:
-                break
-        return min_eval
+        if beta <= alpha:
+            if orderer is not None:
+                orderer.cutoff(move, player_color, depth)
+            break
+
+    if cached:
+        if best_eval >= beta_orig:
+            bound = LOWER if maximizing_player else UPPER
+        elif best_eval <= alpha_orig:
+            bound = UPPER if maximizing_player else LOWER
+        else:
+            bound = EXACT
+        table.store(key, depth, sign * (best_eval - score), bound,
+                    table.hasher.to_canonical(best_move, symmetry))
+    return best_eval
 
 
-# Example of using the Minimax function
-def best_move_for_ai(board, player_color, depth=3):
+def search_root(board, player_color, depth, moves, stats=None, table=None, orderer=None, banked=(0, 0)):
+    """Search every root move to the given depth; return (best_move, best_score).
+
+    banked is (player_color's points, the opponent's points), as in minimax.
+    """
     best_score = float('-inf')
     best_move = None
-    for move in get_all_possible_moves(board, player_color):
-        new_board = make_move(board.copy(), move, player_color)
-        score = minimax(new_board, depth, float('-inf'), float('inf'), False, toggle_player(player_color))
+    root_score = evaluate_board(board, player_color)
+    for move in moves:
+        gain, points = move_value(board, move, player_color)
+        if table is not None:
+            table.hasher.toggle(move[0], move[1], player_color)
+        try:
+            score = minimax(board, depth, best_score, float('inf'), False, toggle_player(player_color),
+                            root_score + gain, stats, table, orderer, (banked[1], banked[0] + points))
+        finally:
+            undo_move(board, move)
+            if table is not None:
+                table.hasher.toggle(move[0], move[1], player_color)
         if score > best_score:
             best_score = score
             best_move = move
-    return best_move
-
-
-def show_endgame_popup(screen, winner, player1_points, player2_points):
-    """Show the endgame popup with the result of the game."""
-    pygame.font.init()
-    font = pygame.font.Font(None, 48)
-
-    # Define the message text
-    if winner == PLAYER1_COLOR:
-        lines = [
-            "Player Wins!",
-            f"Points: {player1_points}"
-        ]
-    elif winner == PLAYER2_COLOR:
-        lines = [
-            "AI Wins!",
-            f"Points: {player2_points}"
-        ]
-    else:
-        lines = [
-            "It's a Tie!",
-            f"Player Points: {player1_points}",
-            f"AI Points: {player2_points}"
-        ]
-
-    # Render the message text
-    screen.fill((255, 255, 255))  # White background
-
-    text_surfaces = [font.render(line, True, (0, 0, 0)) for line in lines]
-    total_height = sum(surf.get_height() for surf in text_surfaces)
-    start_y = (screen.get_height() // 2) - (total_height // 2)
-
-    for text_surface in text_surfaces:
-        text_rect = text_surface.get_rect(center=(screen.get_width() // 2, start_y))
-        screen.blit(text_surface, text_rect)
-        start_y += text_surface.get_height() + 10  # Space between lines
-
-    pygame.display.flip()
+    return best_move, best_score
+
+
+def best_move_for_ai(board, player_color, depth=3, time_limit=None, stats=None, table=None, orderer=None,
+                     book=None, banked=(0, 0), cancel=None):
+    """Pick a move for player_color with alpha-beta search.
+
+    Without a time_limit the root moves are searched `depth` plies deep. With
+    one, the search deepens from 0 up to `depth` and returns the best move of
+    the deepest iteration that finished within time_limit seconds. A
+    TranspositionTable can be passed in and kept across moves and games,
+    and a MoveOrderer to order (and with top_k, prune) the moves. An
+    opening.OpeningBook entry searched at least `depth` plies deep, and at
+    least as wide as this search (full width, or a top_k no smaller than the
+    orderer's), is played without searching. banked is (player_color's points, the
+    opponent's points), so lines that pass WIN_POINTS end where the game would.
+    Setting the threading.Event `cancel` stops the search early; the move
+    returned then (None if no iteration finished) is meant to be dropped.
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.cancel = cancel
+    if table is not None:
+        table.new_search(board)
+    profiler = profiling.active
+    if profiler is not None:
+        profiler.begin_move('best_move_for_ai')
+        nodes = stats.nodes
+    try:
+        start = time.perf_counter()
+        if book is not None:
+            entry = book.lookup(board, player_color)
+            top_k = orderer.top_k if orderer is not None else None
+            if (entry is not None and entry[3] >= depth
+                    and (entry[4] == 0 or (top_k is not None and top_k <= entry[4]))):
+                row, col, stats.score, stats.depth, _ = entry
+                stats.elapsed = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.stage('book', start)
+                    profiler.count('book_hits')
+                return row, col
+        moves = list(get_all_possible_moves(board, player_color))
+        if orderer is not None:
+            orderer.new_search()
+            orderer.start_iteration(depth)
+            moves = orderer.order(board, moves, player_color, depth + 1)
+        best_move = None
+
+        for current_depth in (range(depth + 1) if time_limit is not None else [depth]):
+            if cancel is not None and cancel.is_set():
+                break
+            if orderer is not None:
+                orderer.start_iteration(current_depth)
+            try:
+                move, score = search_root(board, player_color, current_depth, moves, stats, table, orderer, banked)
+            except SearchTimeout:
+                break
+            best_move = move
+            stats.depth = current_depth
+            stats.score = score
+            if time_limit is not None:
+                # Search the previous best move first next time; it sets the tightest bound
+                moves.remove(move)
+                moves.insert(0, move)
+                # Depth 0 always completes so there is a move to return
+                stats.deadline = start + time_limit
+        stats.deadline = None
+        stats.elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.stage('search', start)
+            profiler.count('search_nodes', stats.nodes - nodes)
+            profiler.count('search_depth', stats.depth)
+        return best_move
+    finally:
+        if profiler is not None:
+            profiler.end_move()
 
-    # Wait for a bit to show the message
-    pygame.time.wait(2000)  # Wait for 2 seconds
 
 def is_shape_complete(board, row, col, coords, player_color):
     """Check if the shape is complete at the given position on the board for the given player color."""
+    size = len(board)
     return all(
-        0 <= row + dr < BOARD_SIZE and
-        0 <= col + dc < BOARD_SIZE and
+        0 <= row + dr < size and
+        0 <= col + dc < size and
         board[row + dr][col + dc] == player_color
         for dr, dc in coords
     )
 
-def check_shapes(board, row, col, player_color):
-    """Check all possible shapes and calculate points for a move at the given position on the board."""
+def check_shapes_scan(board, row, col, player_color):
+    """Reference version of check_shapes that rescans every shape offset (used by bench.py)."""
     points = 0
-
-    for shape_name, (coords, base_points) in SHAPES.items():
-        # Check if the shape can be formed with the current move
-        for dr, dc in coords:
-            start_row = row - dr
-            start_col = col - dc
-            
-            if 0 <= start_row < BOARD_SIZE and 0 <= start_col < BOARD_SIZE:
-                if is_shape_complete(board, start_row, start_col, coords, player_color):
-                    points += base_points * (
-                        1 if shape_name == 'L*1:' else
-                        2 if shape_name == 'Box*2:' else
-                        3
-                    )
-                    break  # No need to check other positions for the same shape
+    size = len(board)
+
+    for shape in COMPILED_SHAPES:
+        # Check if the shape can be formed with the current move, in any of its orientations;
+        # a shape scores at most once per move
+        if any(
+            0 <= row - dr < size and 0 <= col - dc < size and
+            is_shape_complete(board, row - dr, col - dc, coords, player_color)
+            for variant_name, coords in shape.variants
+            for dr, dc in coords
+        ):
+            points += shape.points
 
     return points
 
@@ -149,108 +313,176 @@ def evaluate_move(board, row, col, player_color):
     
 #     return best_move
 
+def greedy_move(board, player_color):
+    """The greedy AI above, kept playable: the move that makes plus blocks the most shape points."""
+    best_move = None
+    best_score = -1  # Start with a very low score
+
+    for row, col in get_all_possible_moves(board, player_color):
+        move_points, block_points = evaluate_move(board, row, col, player_color)
+        score = move_points + block_points
+        if score > best_score:
+            best_score = score
+            best_move = (row, col)
+
+    return best_move
+
 def calculate_shape_completion(board, row, col, coords, player_color):
     completed_cells = 0
     total_cells = len(coords)
+    size = len(board)
     
     for dr, dc in coords:
-        if 0 <= row + dr < BOARD_SIZE and 0 <= col + dc < BOARD_SIZE and board[row + dr][col + dc] == player_color:
+        if 0 <= row + dr < size and 0 <= col + dc < size and board[row + dr][col + dc] == player_color:
             completed_cells += 1
             
     return (completed_cells / total_cells) * 100
 
 
-def check_partial_shapes(board, row, col, player_color):
+def check_partial_shapes_scan(board, row, col, player_color):
+    """Reference version of check_partial_shapes that rescans every shape offset (used by bench.py)."""
     points = 0
+    size = len(board)
 
-    for shape_name, (coords, base_points) in SHAPES.items():
-        # Check if the shape can be formed with the current move
-        for dr, dc in coords:
-            start_row = row - dr
-            start_col = col - dc
-            
-            if 0 <= start_row < BOARD_SIZE and 0 <= start_col < BOARD_SIZE:
-                completion_percentage = calculate_shape_completion(board, start_row, start_col, coords, player_color)
-                points += (completion_percentage / 100) * base_points
+    for shape in COMPILED_SHAPES:
+        for variant_name, coords in shape.variants:
+            # Check if the shape can be formed with the current move
+            for dr, dc in coords:
+                start_row = row - dr
+                start_col = col - dc
+
+                if 0 <= start_row < size and 0 <= start_col < size:
+                    completion_percentage = calculate_shape_completion(board, start_row, start_col, coords, player_color)
+                    points += (completion_percentage / 100) * shape.base_points
 
     return points
 
 
-def fuzzyLogic(board, player_color, opponent_color, empty, points):
-    #membership for board state
-    board_state = {}
-    if 0<=empty<=30:
-        board_state["full"] = 1
-        board_state["medium"] = 0
-        board_state["empty"] = 0
-    elif 30<empty<35:
-        board_state["full"] = (35-empty)/5
-        board_state["medium"] = (empty-30)/5
-        board_state["empty"] = 0
-    elif 35<=empty<=70:
-        board_state["full"] = 0
-        board_state["medium"] = 1
-        board_state["empty"] = 0
-    elif 70<empty<75:
-        board_state["full"] = 0
-        board_state["medium"] = (75-empty)/5
-        board_state["empty"] = (empty-70)/5
-    elif 75<=empty<=100:
-        board_state["full"] = 0
-        board_state["medium"] = 0
-        board_state["empty"] = 1
-    
-    #membership for point diff
-    point_diff = {}
-    if 0<=points<=15:
-        point_diff["low"] = 1
-        point_diff["medium"] = 0
-        point_diff["high"] = 0
-    elif 15<points<20:
-        point_diff["low"] = (20-points)/5
-        point_diff["medium"] = (points-15)/5
-        point_diff["high"] = 0
-    elif 20<=points<=30:
-        point_diff["low"] = 0
-        point_diff["medium"] = 1
-        point_diff["high"] = 0
-    elif 30<points<35:
-        point_diff["low"] = 0
-        point_diff["medium"] = (35-points)/5
-        point_diff["high"] = (points-30)/5
-    elif 35<=points<=100:
-        point_diff["low"] = 0
-        point_diff["medium"] = 0
-        point_diff["high"] = 1
-    
-    #rules evaluation
-    move = {}
-    move["offensive"] = max(min(board_state["empty"],point_diff["low"]),
-                            min(board_state["empty"],point_diff["high"]),
-                            min(board_state["medium"],point_diff["low"]),
-                            min(board_state["medium"],point_diff["high"]),
-                            min(board_state["full"],point_diff["low"]),
-                            min(board_state["full"],point_diff["high"]))
-    
-    move["deffensive"] = max(min(board_state["empty"],point_diff["medium"]),
-                             min(board_state["medium"],point_diff["medium"]),
-                             min(board_state["full"],point_diff["medium"]))
-    
-    centroid = (0+10+20)*move["offensive"]+(30+40+50)*move["deffensive"]/(3*(move["offensive"]+move["deffensive"]))
+# Per-cell placement index: for every cell, the placements of every shape that cover it.
+# Built lazily for each board size from the compiled shape catalog, and dropped
+# when shapes.load_catalog installs a new one.
+_cell_index = {}
+_cell_index_version = shapes.catalog_version
+
+
+def build_cell_index(compiled_shapes, size):
+    """Map each cell to the placements covering it.
+
+    Returns (complete, partial) grids. complete[row][col] lists
+    (shape_index, shape_points, cells) for placements fully on the board;
+    partial[row][col] lists (base_points, total_cells, cells) for every
+    placement whose anchor is on the board, with cells clipped to the board.
+    """
+    complete = [[[] for _ in range(size)] for _ in range(size)]
+    partial = [[[] for _ in range(size)] for _ in range(size)]
+    for shape in compiled_shapes:
+        for (variant_name, coords), (height, width) in zip(shape.variants, shape.bounds):
+            for row in range(size):
+                for col in range(size):
+                    # Same anchor order as the scanning versions, so float sums match exactly
+                    for dr, dc in coords:
+                        start_row = row - dr
+                        start_col = col - dc
+                        if 0 <= start_row < size and 0 <= start_col < size:
+                            if start_row + height <= size and start_col + width <= size:
+                                cells = tuple((start_row + r, start_col + c) for r, c in coords)
+                                complete[row][col].append((shape.index, shape.points, cells))
+                            else:
+                                cells = tuple(
+                                    (start_row + r, start_col + c)
+                                    for r, c in coords
+                                    if start_row + r < size and start_col + c < size
+                                )
+                            partial[row][col].append((shape.base_points, len(coords), cells))
+    return complete, partial
+
+
+def get_cell_index(size=BOARD_SIZE):
+    global _cell_index_version
+    if _cell_index_version != shapes.catalog_version:
+        _cell_index.clear()
+        _cell_index_version = shapes.catalog_version
+    index = _cell_index.get(size)
+    if index is None:
+        index = _cell_index[size] = build_cell_index(COMPILED_SHAPES, size)
+    return index
+
+
+def check_shapes(board, row, col, player_color):
+    """Check all possible shapes and calculate points for a move at the given position on the board."""
+    profiler = profiling.active
+    if profiler is not None:
+        start = time.perf_counter()
+    points = 0
+    scored = None
+
+    for shape_index, shape_points, cells in get_cell_index(len(board))[0][row][col]:
+        # Placements are grouped by shape; each shape scores at most once per move
+        if shape_index == scored:
+            continue
+        for r, c in cells:  # A plain loop: all() over a generator costs more than the scan itself
+            if board[r][c] != player_color:
+                break
+        else:
+            points += shape_points
+            scored = shape_index
 
-    if 0<=centroid<=20:
-        place_color = player_color
-    elif 20<=centroid<=50:
-        place_color = opponent_color
-    print(place_color)
+    if profiler is not None:
+        profiler.stage('check_shapes', start, span=False)
+    return points
 
-    if place_color == player_color:
-        opposite_color = opponent_color
-    elif place_color == opponent_color:
-        opposite_color = player_color
 
-    position = geneticAlgo(board,place_color,opposite_color,empty)
-    return position
+def check_partial_shapes(board, row, col, player_color):
+    points = 0
+
+    for base_points, total_cells, cells in get_cell_index(len(board))[1][row][col]:
+        completed_cells = 0
+        for r, c in cells:
+            if board[r][c] == player_color:
+                completed_cells += 1
+        completion_percentage = (completed_cells / total_cells) * 100
+        points += (completion_percentage / 100) * base_points
+
+    return points
+
+
+def fuzzyLogic(board, player_color, opponent_color, empty, points, scorer=None, ga=None, book=None, cancel=None):
+    # Offensive or defensive move from the precompiled fuzzy surface (see fuzzy.py);
+    # the board state is the percentage of empty cells so any board size works.
+    # cancel (a threading.Event) is handed to the GA, which stops evolving once it is set
+    profiler = profiling.active
+    if profiler is not None:
+        profiler.begin_move('fuzzyLogic')
+        start = time.perf_counter()
+    try:
+        if book is not None:
+            # An opening.OpeningBook move, searched offline, replaces both the fuzzy decision and the GA
+            entry = book.lookup(board, player_color, len(board) * len(board) - empty)
+            if entry is not None:
+                if profiler is not None:
+                    profiler.stage('book', start)
+                    profiler.count('book_hits')
+                log.debug("Book move %s", entry)
+                return [entry[0], entry[1]]
+        empty_percent = empty * 100 / (len(board) * len(board))
+        if fuzzy.offensive(empty_percent, points):
+            place_color = player_color
+        else:
+            place_color = opponent_color
+        if profiler is not None:
+            profiler.stage('fuzzy', start)
+        log.debug("Place color %s", place_color)
+
+        if place_color == player_color:
+            opposite_color = opponent_color
+        elif place_color == opponent_color:
+            opposite_color = player_color
+
+        # ga: any function with geneticAlgo's signature, e.g. genetic.geneticAlgoArray
+        return (ga or geneticAlgo)(board,place_color,opposite_color,empty,scorer,cancel=cancel)
+    finally:
+        if profiler is not None:
+            profiler.end_move()
 
 #genetic algorithm
 def convert(cromosome):
@@ -258,12 +490,16 @@ def convert(cromosome):
     dec = int(binary_str, 2)
     return dec
 
+def chromosome_bits(length):
+    """Bits needed to address cells 0..length."""
+    return max(1, length.bit_length())
+
 def population(length):
     cromosome = []
     cr = 0
     while cr<10:
         list = []
-        for li in range(7):
+        for li in range(chromosome_bits(length)):
             list.append(random.randint(0,1))
 
         if convert(list)<length:
@@ -322,7 +558,7 @@ def crossover(new_cromosome,crosspoint):
     id1=0
     while id1<9:
         id2 = id1+1
-        for i in range(7):
+        for i in range(len(cross[id1])):
             if i >= crosspoint:
                 tmp = cross[id1][i]
                 cross[id1][i] = cross[id2][i]
@@ -337,7 +573,7 @@ def mutation(crosscr,length):
         indx.append(random.randint(0,9))
     id = 0
     while id < len(indx):
-        pos = random.randint(0,4)
+        pos = random.randint(0,len(mutat[indx[id]])-1)  # low bits too, or an out-of-range chromosome can never be repaired
         mutat[indx[id]][pos] = 1 - crosscr[indx[id]][pos]
         if convert(mutat[indx[id]])<length:
             id = id+1
@@ -348,22 +584,16 @@ def mutation(crosscr,length):
 def validity(cromosome,length):
     for cr in cromosome:
         if length<=convert(cr):
-            print("Invalid ",length,convert(cr))        
+            log.warning("Invalid chromosome %s for %s cells", convert(cr), length)
         # print("Cromosome",cr,convert(cr))
 
 
-def geneticAlgo(board,player_color,opponent_color,length):
+def partial_points_scan(board, player_color):
+    """Partial-shape score of each empty cell, one check_partial_shapes call at a time."""
     board_position = []
     points = []
-    if  length<2:
-        return (row,col) (
-            board[row][col] == None
-            for row in range(BOARD_SIZE)
-            for col in range(BOARD_SIZE)
-        )
-
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
+    for row in range(len(board)):
+        for col in range(len(board)):
             if board[row][col] == None:
                 board[row][col] = player_color
                 board_position.append([row,col])
@@ -374,8 +604,42 @@ def geneticAlgo(board,player_color,opponent_color,length):
                 # board[row][col] = None
                 # points.append(move+block)
                 points.append(move)
-    for i in range(len(board_position)):
-        print(board_position[i],points[i])
+    return board_position, points
+
+
+def geneticAlgo(board,player_color,opponent_color,length,scorer=None,cancel=None):
+    if  length<2:
+        # Nothing to evolve: take the last empty cell
+        return next(
+            [row,col]
+            for row in range(len(board))
+            for col in range(len(board))
+            if board[row][col] == None
+        )
+
+    profiler = profiling.active
+    if profiler is not None:
+        start = time.perf_counter()
+    if scorer is not None:
+        # IncrementalScorer kept up to date by the caller: no board scan at all
+        board_position, points = scorer.candidates(player_color)
+        target = scorer.best(player_color)
+    elif get_partial_shape_points() is not None:
+        board_position, points = get_partial_shape_points()(board, player_color, SHAPES)
+    else:
+        board_position, points = partial_points_scan(board, player_color)
+    if scorer is None:
+        target = max(points)
+    if profiler is not None:
+        profiler.stage('scoring', start)
+        profiler.count('cells_scored', len(points))
+        start = time.perf_counter()
+    if log.isEnabledFor(logs.TRACE):
+        for i in range(len(board_position)):
+            log.log(logs.TRACE, "%s %s", board_position[i], points[i])
+    if profiler is not None:
+        profiler.stage('log', start)
+        start = time.perf_counter()
     cromosome = population(len(points)-1)
     # print("out ",length,len(points))
     # print("Cromosme->",len(cromosome),len(points))
@@ -389,10 +653,11 @@ def geneticAlgo(board,player_color,opponent_color,length):
 
     cnt = 1
 
-    while best_s<max(points) and cnt<100:
+    while best_s<target and cnt<100:
 
         new_cromosome = selection(actualCount,cromosome)
-        crosspoint = random.randint(2,6)
+        bits = chromosome_bits(len(points)-1)
+        crosspoint = random.randint(min(2,bits-1),bits-1)
         crosscr = crossover(new_cromosome,crosspoint)
         #print(len(crosscr))
         mutat = mutation(crosscr,len(points)-1)
@@ -402,36 +667,82 @@ def geneticAlgo(board,player_color,opponent_color,length):
         # validity(cromosome,len(points))
         # print("in ",length,len(points))
         actualCount, fitValue = fitness(cromosome,points)
-        maxfit = max(fitValue)
-        if maxfit>best_s:
-            best_s = maxfit
-            best_cr = cromosome[fitValue.index(maxfit)] 
-    print("Best-> ",board_position[convert(best_cr)],points[convert(best_cr)],best_s,convert(best_cr))
-    return (board_position[convert(best_cr)])
+        for cr, fit in zip(cromosome, fitValue):
+            # crossover can produce out-of-range cells, and chromosomes are edited in place later
+            if fit>best_s and convert(cr)<len(points):
+                best_s = fit
+                best_cr = cr[:]
+        if cancel is not None and cancel.is_set() and best_cr:
+            break  # The caller no longer wants this move
+    if profiler is not None:
+        profiler.stage('ga', start)
+        profiler.count('ga_generations', cnt)
+    best = convert(best_cr)
+    log.debug("Best-> %s %s %s %s", board_position[best], points[best], best_s, best)
+    return list(board_position[best])  # A new [row, col]: board_position may belong to the scorer
 def evaluate_board(board, player_color):
-    
-    pass
+    """Static evaluation for player_color: partial-shape progress of its stones minus the opponent's.
 
-def is_game_over(board):
+    minimax keeps this up to date move by move with move_value instead of calling it at every leaf.
+    """
+    opponent_color = toggle_player(player_color)
+    score = 0
+    for row in range(len(board)):
+        for col in range(len(board)):
+            if board[row][col] == player_color:
+                score += check_partial_shapes(board, row, col, player_color)
+            elif board[row][col] == opponent_color:
+                score -= check_partial_shapes(board, row, col, opponent_color)
+    return PARTIAL_WEIGHT * score
+
+def max_move_points():
+    """Most points one move can score: every shape completed at once, each at most once."""
+    return sum(shape.points for shape in COMPILED_SHAPES)
+
+def is_game_over(board, points=(0, 0)):
     """
-    Check if the game is over.
+    Check if the game is over, as engine.Game.check_game_over does: no empty cell
+    left, or either of the two players' points (in any order) above WIN_POINTS.
     """
-    # Implement your logic to check for game over
-    pass
+    return points[0] > WIN_POINTS or points[1] > WIN_POINTS or not any(cell is None for line in board for cell in line)
 
 def get_all_possible_moves(board, player_color):
     """
     Generate all possible moves for the given player.
     """
-    # Implement logic to generate moves
-    pass
+    return [
+        (row, col)
+        for row in range(len(board))
+        for col in range(len(board))
+        if board[row][col] is None
+    ]
 
 def make_move(board, move, player_color):
     """
-    Make a move on the board and return the new board state.
+    Make a move on the board in place and return the points it scores; undo_move reverts it.
+    """
+    row, col = move
+    board[row][col] = player_color
+    return check_shapes(board, row, col, player_color)
+
+def undo_move(board, move):
+    """
+    Take back a move made with make_move.
+    """
+    row, col = move
+    board[row][col] = None
+
+def move_value(board, move, player_color):
+    """
+    Make a move and return (how much it changes the mover's evaluation, the points it banks).
+    The change is the banked points plus the change of evaluate_board's partial-shape term.
     """
-    # Implement the move logic
-    pass
+    points = make_move(board, move, player_color)
+    row, col = move
+    # The new stone scores its own partial shapes and adds one cell to every
+    # placement it shares with the mover's other stones: 2 * partial - weight
+    weight = sum(base_points / total_cells for base_points, total_cells, cells in get_cell_index(len(board))[1][row][col])
+    return points + PARTIAL_WEIGHT * (2 * check_partial_shapes(board, row, col, player_color) - weight), points
 
 def toggle_player(player_color):
     """
@@ -0,0 +1,91 @@
+import argparse
+import random
+import time
+import logs
+import profiling
+from constants import BOARD_SIZE, PLAYER1_COLOR
+from engine import Game
+from profiling import percentile
+
+
+def play_game(game, latencies=None):
+    """Play one AI-vs-AI game to the end on the given Game and return it.
+
+    If latencies is a list, the time of every AI move (in seconds) is appended to it.
+    """
+    game.reset()
+    while not game.game_over:
+        start = time.perf_counter()
+        row, col = game.ai_move()
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+        game.play(row, col)
+    return game
+
+
+def run(games, seed=None, size=BOARD_SIZE, book=None):
+    """Play `games` self-play games on a size x size board, with an optional opening.OpeningBook.
+
+    Returns (results, total moves, elapsed seconds, per-move AI latencies).
+    """
+    if seed is not None:
+        random.seed(seed)
+    game = Game(size, book)
+    results = []
+    moves = 0
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(games):
+        play_game(game, latencies)
+        moves += game.moves
+        results.append((game.winner, game.player1_points, game.player2_points))
+    elapsed = time.perf_counter() - start
+    return results, moves, elapsed, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games headlessly and report throughput.")
+    parser.add_argument('-n', '--games', type=int, default=10, help="number of games to play")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log the AI's decisions (same as --log-level debug)")
+    parser.add_argument('--log-level', choices=sorted(logs.LEVELS, key=logs.LEVELS.get), default=None,
+                        help="AI log level; trace adds every GA candidate (default: $COLOR_THE_MAP_LOG or warning)")
+    parser.add_argument('--log-json', metavar='PATH', help="also write the log to PATH as buffered JSON lines")
+    parser.add_argument('--size', type=int, default=BOARD_SIZE, help="board side length")
+    parser.add_argument('--latency-target', type=float, default=100.0,
+                        help="per-move AI latency target in milliseconds")
+    parser.add_argument('--book', metavar='PATH', help="opening book for the AI (built with opening.py)")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="record per-stage AI timings to PATH as JSON lines (summarize with profiling.py)")
+    parser.add_argument('--chrome-trace', metavar='PATH',
+                        help="record per-stage AI timings to PATH in Chrome trace format")
+    args = parser.parse_args(argv)
+
+    logs.configure(args.log_level or ('debug' if args.verbose else None), json_path=args.log_json)
+    profiler = profiling.enable() if args.profile or args.chrome_trace else None
+    book = None
+    if args.book:
+        from opening import OpeningBook
+        book = OpeningBook(args.book)
+    results, moves, elapsed, latencies = run(args.games, args.seed, args.size, book)
+    profiling.disable()
+    if args.profile:
+        profiler.write_jsonl(args.profile)
+    if args.chrome_trace:
+        profiler.write_chrome_trace(args.chrome_trace)
+    p1_wins = sum(1 for winner, _, _ in results if winner == PLAYER1_COLOR)
+    ties = sum(1 for winner, _, _ in results if winner is None)
+    print(f"Games: {len(results)}  Moves: {moves}  Time: {elapsed:.2f}s")
+    print(f"Player 1 wins: {p1_wins}  Player 2 wins: {len(results) - p1_wins - ties}  Ties: {ties}")
+    print(f"{len(results) / elapsed:.2f} games/sec, {moves / elapsed:.1f} moves/sec")
+    if latencies:
+        over = sum(1 for latency in latencies if latency * 1000 > args.latency_target)
+        print(f"AI move latency: p50 {percentile(latencies, 0.5) * 1000:.1f} ms  "
+              f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms  max {max(latencies) * 1000:.1f} ms  "
+              f"({over}/{len(latencies)} over {args.latency_target:g} ms)")
+    if book is not None:
+        print(f"Opening book: {book.hits} hits, {book.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from constants import SHAPE_CATALOG
+
+
+def shift(cells):
+    """Shift cells so the smallest row and column are 0, keeping their order."""
+    min_r = min(r for r, c in cells)
+    min_c = min(c for r, c in cells)
+    return tuple((r - min_r, c - min_c) for r, c in cells)
+
+
+def normalize(cells):
+    """Shift cells so the smallest row and column are 0, in sorted order."""
+    return tuple(sorted(shift(cells)))
+
+
+def orientations(cells, rotations=False, reflections=False):
+    """The distinct orientations of cells, shifted to start at row and column 0.
+
+    The declared orientation comes first with its cell order kept, then the others.
+    """
+    transforms = [lambda r, c: (r, c)]
+    if rotations:
+        transforms += [lambda r, c: (c, -r), lambda r, c: (-r, -c), lambda r, c: (-c, r)]
+    if reflections:
+        transforms += [lambda r, c, t=t: t(r, -c) for t in list(transforms)]
+
+    variants = [shift(cells)]
+    seen = {normalize(cells)}
+    for transform in transforms[1:]:
+        variant = normalize([transform(r, c) for r, c in cells])
+        if variant not in seen:
+            seen.add(variant)
+            variants.append(variant)
+    return variants
+
+
+class CompiledShape:
+    """One catalog entry with its offset table built: every orientation that scores."""
+
+    def __init__(self, index, name, spec):
+        self.index = index  # Position in the catalog; cheaper to compare than the name
+        self.name = name
+        self.base_points = spec['points']
+        self.multiplier = spec['multiplier']
+        self.points = self.base_points * self.multiplier  # Awarded for completing the shape
+        coords = orientations(spec['cells'], spec.get('rotations', False), spec.get('reflections', False))
+        # (variant_name, coords) for each orientation; the declared one keeps the shape's name
+        self.variants = [(name if number == 0 else f"{name}/{number}", offsets)
+                         for number, offsets in enumerate(coords)]
+        self.bounds = [(max(r for r, c in offsets) + 1, max(c for r, c in offsets) + 1)
+                       for offsets in coords]  # (height, width) of each orientation
+
+    @property
+    def cells(self):
+        """The declared orientation, as drawn in the side panel."""
+        return self.variants[0][1]
+
+
+def compile_catalog(catalog=SHAPE_CATALOG):
+    return [CompiledShape(index, name, spec) for index, (name, spec) in enumerate(catalog.items())]
+
+
+def variant_table(compiled_shapes):
+    return {variant_name: [list(coords), shape.base_points]
+            for shape in compiled_shapes for variant_name, coords in shape.variants}
+
+
+COMPILED_SHAPES = compile_catalog()
+
+# One entry per orientation in the {name: [coords, base_points]} form taken by
+# the per-placement scorers (incremental, vectorized, bitboard masks).
+SHAPES = variant_table(COMPILED_SHAPES)
+
+# The catalog in use, and a counter bumped by load_catalog; caches built from the
+# catalog (rules.get_cell_index, bitboard.shape_masks) compare it to rebuild themselves.
+catalog = SHAPE_CATALOG
+catalog_version = 0
+
+
+def load_catalog(new_catalog=SHAPE_CATALOG):
+    """Install a new shape catalog.
+
+    COMPILED_SHAPES and SHAPES are updated in place, so modules that imported
+    them see the new shapes. Scorers built earlier keep their own tables.
+    """
+    global catalog, catalog_version
+    catalog = new_catalog
+    COMPILED_SHAPES[:] = compile_catalog(catalog)
+    SHAPES.clear()
+    SHAPES.update(variant_table(COMPILED_SHAPES))
+    catalog_version += 1
@@ -0,0 +1,49 @@
+import random
+from constants import PLAYER1_COLOR
+from ordering import MoveOrderer
+from rules import best_move_for_ai, fuzzyLogic, get_all_possible_moves, greedy_move, toggle_player
+
+# Every strategy takes an engine.Game with the strategy's color to move and returns (row, col).
+# Randomized ones draw from the global random module, so seeding it makes a game reproducible.
+
+
+def fuzzy_ga(game):
+    """The live game AI: fuzzyLogic picks attack or defence, geneticAlgo picks the cell."""
+    row, col = game.ai_move()
+    return row, col
+
+
+def fuzzy_array(game):
+    """fuzzyLogic with the array-backed GA (needs numpy)."""
+    from genetic import geneticAlgoArray
+    player_color = game.current_player
+    row, col = fuzzyLogic(game.board, player_color, toggle_player(player_color), game.empty,
+                          abs(game.player1_points - game.player2_points), game.scorer, geneticAlgoArray, game.book)
+    return row, col
+
+
+def minimax2(game):
+    """Alpha-beta search two plies deep, keeping the 8 best pre-sorted moves at each node."""
+    if game.current_player == PLAYER1_COLOR:
+        banked = game.player1_points, game.player2_points
+    else:
+        banked = game.player2_points, game.player1_points
+    return best_move_for_ai(game.board, game.current_player, depth=2, orderer=MoveOrderer(top_k=8), book=game.book,
+                            banked=banked)
+
+
+def greedy(game):
+    return greedy_move(game.board, game.current_player)
+
+
+def random_move(game):
+    return random.choice(get_all_possible_moves(game.board, game.current_player))
+
+
+STRATEGIES = {
+    'fuzzy': fuzzy_ga,
+    'fuzzy-array': fuzzy_array,
+    'minimax': minimax2,
+    'greedy': greedy,
+    'random': random_move,
+}
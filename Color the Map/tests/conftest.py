@@ -0,0 +1,29 @@
+import os
+import random
+import sys
+import pytest
+
+# The game's modules import each other by plain name from the game directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shapes
+from constants import PLAYER1_COLOR, PLAYER2_COLOR, SHAPE_CATALOG
+
+
+def random_board(fill=0.5, seed=0, size=10):
+    """A board with roughly `fill` of its cells taken at random by either player (as bench.random_board)."""
+    rng = random.Random(seed)
+    return [[rng.choice((PLAYER1_COLOR, PLAYER2_COLOR)) if rng.random() < fill else None
+             for _ in range(size)] for _ in range(size)]
+
+
+# Every orientation of every shape, so variant handling is exercised too
+ALL_ORIENTATIONS = {name: dict(spec, rotations=True, reflections=True) for name, spec in SHAPE_CATALOG.items()}
+
+
+@pytest.fixture(params=['default', 'all orientations'])
+def catalog(request):
+    """Run the test under the shipped catalog and under one with every orientation."""
+    shapes.load_catalog(SHAPE_CATALOG if request.param == 'default' else ALL_ORIENTATIONS)
+    yield shapes.catalog
+    shapes.load_catalog()
@@ -0,0 +1,26 @@
+import pytest
+import bitboard
+import rules
+from conftest import random_board
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+
+
+@pytest.mark.parametrize('size, fill, seed', [(10, 0.5, 0), (10, 0.8, 1), (7, 0.6, 2), (13, 0.4, 3)])
+def test_bitboard_scores_match_lists(catalog, size, fill, seed):
+    board = random_board(fill, seed, size)
+    bits = bitboard.BitBoard.from_board(board)
+    for row in range(size):
+        for col in range(size):
+            for color in (PLAYER1_COLOR, PLAYER2_COLOR):
+                assert bitboard.check_shapes(bits, row, col, color) == rules.check_shapes(board, row, col, color)
+                assert bitboard.check_partial_shapes(bits, row, col, color) == pytest.approx(
+                    rules.check_partial_shapes(board, row, col, color))
+
+
+def test_bitboard_round_trip():
+    board = random_board(0.5, 4)
+    bits = bitboard.BitBoard.from_board(board)
+    assert bits.to_board() == board
+    copy = bits.copy()
+    copy.clear(*next((row, col) for row in range(10) for col in range(10) if board[row][col] is not None))
+    assert bits.to_board() == board
@@ -0,0 +1,39 @@
+import threading
+import rules
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+from engine import Game
+
+
+def test_cancelled_background_move_is_dropped():
+    game = Game(10)
+    move = game.ai_move_async()
+    move.cancel()
+    move.thread.join(5)
+    assert move.done()
+    assert move.result(game) is None
+
+
+def test_background_move_is_stale_after_reset():
+    game = Game(10)
+    move = game.ai_move_async()
+    move.thread.join(5)
+    assert move.result(game) is not None
+    game.reset()
+    assert move.result(game) is None
+
+
+def test_cancel_stops_the_genetic_algorithm():
+    board = [[None] * 10 for _ in range(10)]
+    cancel = threading.Event()
+    cancel.set()
+    row, col = rules.fuzzyLogic(board, PLAYER1_COLOR, PLAYER2_COLOR, 100, 0, cancel=cancel)
+    assert board[row][col] is None
+
+
+def test_cancel_stops_the_search():
+    cancel = threading.Event()
+    cancel.set()
+    stats = rules.SearchStats()
+    assert rules.best_move_for_ai([[None] * 10 for _ in range(10)], PLAYER1_COLOR, 4, time_limit=60,
+                                  stats=stats, cancel=cancel) is None
+    assert stats.nodes == 0
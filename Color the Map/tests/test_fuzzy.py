@@ -0,0 +1,44 @@
+import fuzzy
+
+
+def rule_chain(empty, points):
+    """The hand-written controller fuzzyLogic used before it was compiled: True to play offensively."""
+    if 0 <= empty <= 30:
+        board_state = {'full': 1, 'medium': 0, 'empty': 0}
+    elif 30 < empty < 35:
+        board_state = {'full': (35 - empty) / 5, 'medium': (empty - 30) / 5, 'empty': 0}
+    elif 35 <= empty <= 70:
+        board_state = {'full': 0, 'medium': 1, 'empty': 0}
+    elif 70 < empty < 75:
+        board_state = {'full': 0, 'medium': (75 - empty) / 5, 'empty': (empty - 70) / 5}
+    else:
+        board_state = {'full': 0, 'medium': 0, 'empty': 1}
+
+    if 0 <= points <= 15:
+        point_diff = {'low': 1, 'medium': 0, 'high': 0}
+    elif 15 < points < 20:
+        point_diff = {'low': (20 - points) / 5, 'medium': (points - 15) / 5, 'high': 0}
+    elif 20 <= points <= 30:
+        point_diff = {'low': 0, 'medium': 1, 'high': 0}
+    elif 30 < points < 35:
+        point_diff = {'low': 0, 'medium': (35 - points) / 5, 'high': (points - 30) / 5}
+    else:
+        point_diff = {'low': 0, 'medium': 0, 'high': 1}
+
+    offensive = max(min(board_state[state], point_diff[diff])
+                    for state in ('empty', 'medium', 'full') for diff in ('low', 'high'))
+    defensive = max(min(board_state[state], point_diff['medium']) for state in ('empty', 'medium', 'full'))
+    centroid = (0 + 10 + 20) * offensive + (30 + 40 + 50) * defensive / (3 * (offensive + defensive))
+    return 0 <= centroid <= 20
+
+
+def test_surface_matches_the_rule_chain():
+    for empty_percent in range(fuzzy.DOMAIN + 1):
+        for points in range(fuzzy.DOMAIN + 1):
+            assert fuzzy.offensive(empty_percent, points) == rule_chain(empty_percent, points), (empty_percent, points)
+
+
+def test_inputs_past_the_domain_are_clamped():
+    assert fuzzy.offensive(-5, 0) == fuzzy.offensive(0, 0)
+    assert fuzzy.offensive(50, 250) == fuzzy.offensive(50, 100)
+    assert fuzzy.offensive(50.4, 24.6) == fuzzy.offensive(50, 25)
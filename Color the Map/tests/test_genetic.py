@@ -0,0 +1,37 @@
+import pytest
+from conftest import random_board
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+
+np = pytest.importorskip('numpy')
+from genetic import chromosome_width, evolve, geneticAlgoArray, run_generations
+
+
+def test_chromosome_width_addresses_every_cell():
+    for cells in (1, 2, 3, 64, 65, 100):
+        assert 1 << chromosome_width(cells) >= cells
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_evolve_finds_the_best_cell(seed):
+    points = [float(index % 7) for index in range(100)]
+    points[63] = 20.0
+    best, generations = evolve(points, generations=2000, rng=np.random.default_rng(seed))
+    assert best == 63
+    assert 1 <= generations <= 2000
+
+
+def test_population_stays_on_the_board():
+    fitness = np.arange(37, dtype=np.float64)
+    population = np.zeros(11, dtype=np.int64)
+    population, best, best_fitness, generations = run_generations(fitness, population, 50,
+                                                                  rng=np.random.default_rng(0))
+    assert generations == 50
+    assert population.min() >= 0 and population.max() < 37
+    assert fitness[best] == best_fitness
+
+
+def test_genetic_algo_array_plays_an_empty_cell():
+    board = random_board(0.7, 5)
+    empty = sum(cell is None for line in board for cell in line)
+    row, col = geneticAlgoArray(board, PLAYER2_COLOR, PLAYER1_COLOR, empty)
+    assert board[row][col] is None
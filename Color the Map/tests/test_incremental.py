@@ -0,0 +1,59 @@
+import random
+import pytest
+import rules
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+from incremental import IncrementalScorer
+
+
+def assert_matches_rescan(scorer, board):
+    for color in (PLAYER1_COLOR, PLAYER2_COLOR):
+        cells, points = rules.partial_points_scan(board, color)
+        scorer_cells, scorer_points = scorer.candidates(color)
+        assert [list(cell) for cell in scorer_cells] == cells
+        assert list(scorer_points) == pytest.approx(points)
+        if points:
+            assert scorer.best(color) == pytest.approx(max(points))
+        else:
+            assert scorer.best(color) is None
+
+
+@pytest.mark.parametrize('size, seed', [(6, 0), (10, 1), (17, 2)])
+def test_scorer_matches_a_full_rescan_move_by_move(catalog, size, seed):
+    rng = random.Random(seed)
+    board = [[None] * size for _ in range(size)]
+    scorer = IncrementalScorer(size)
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    rng.shuffle(cells)
+    color = PLAYER1_COLOR
+    for move, (row, col) in enumerate(cells):
+        board[row][col] = color
+        scorer.place(row, col, color)
+        color = PLAYER2_COLOR if color == PLAYER1_COLOR else PLAYER1_COLOR
+        if move % 5 == 0 or move == len(cells) - 1:
+            assert_matches_rescan(scorer, board)
+
+
+def test_copy_is_independent():
+    board = [[None] * 10 for _ in range(10)]
+    scorer = IncrementalScorer(10)
+    for row, col in [(0, 0), (4, 4), (4, 5)]:
+        board[row][col] = PLAYER1_COLOR
+        scorer.place(row, col, PLAYER1_COLOR)
+    copy = scorer.copy()
+    copy.place(5, 5, PLAYER2_COLOR)
+    assert_matches_rescan(scorer, board)
+    board[5][5] = PLAYER2_COLOR
+    assert_matches_rescan(copy, board)
+
+
+def test_moves_and_candidates_do_not_share_the_scorer_state():
+    board = [[None] * 10 for _ in range(10)]
+    scorer = IncrementalScorer(10)
+    board[4][4] = PLAYER1_COLOR
+    scorer.place(4, 4, PLAYER1_COLOR)
+    cells, points = scorer.candidates(PLAYER1_COLOR)
+    cells.clear()
+    points.append(1000.0)
+    move = rules.geneticAlgo(board, PLAYER1_COLOR, PLAYER2_COLOR, 99, scorer)
+    move[0] = -1
+    assert_matches_rescan(scorer, board)
@@ -0,0 +1,69 @@
+import os
+import pytest
+import opening
+import records
+import rules
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+from ordering import MoveOrderer
+
+CORPUS = os.path.join(os.path.dirname(__file__), '..', 'corpus', 'regression.ctmr')
+
+
+@pytest.fixture(scope='module')
+def games():
+    return records.read_records(CORPUS)[:4]
+
+
+def write(tmp_path, games, top_k, name):
+    entries = opening.build(games, plies=3, depth=1, top_k=top_k)
+    path = tmp_path / name
+    opening.write_book(path, entries, plies=3)
+    return entries, opening.OpeningBook(path)
+
+
+def test_every_built_position_is_found(tmp_path, games):
+    entries, book = write(tmp_path, games, None, 'full.bin')
+    assert len(book) == len(entries)
+    for record in games:
+        board = [[None] * record.size for _ in range(record.size)]
+        player_color = PLAYER1_COLOR
+        for row, col, _ in record.moves()[:3]:
+            row_hit, col_hit, score, depth, width = book.lookup(board, player_color)
+            assert board[row_hit][col_hit] is None
+            assert (depth, width) == (1, 0)
+            # The book holds the score the same search finds now (ties may pick another move)
+            stats = rules.SearchStats()
+            rules.best_move_for_ai(board, player_color, 1, stats=stats)
+            assert stats.score == pytest.approx(score)
+            board[row][col] = player_color
+            player_color = PLAYER2_COLOR if player_color == PLAYER1_COLOR else PLAYER1_COLOR
+    book.close()
+
+
+def test_lookup_past_the_covered_plies_misses(tmp_path, games):
+    _, book = write(tmp_path, games, None, 'full.bin')
+    board = [[None] * 10 for _ in range(10)]
+    for col in range(3):
+        board[9][col] = PLAYER1_COLOR
+    assert book.lookup(board, PLAYER1_COLOR) is None
+    book.close()
+
+
+def test_search_only_takes_entries_as_wide_as_itself(tmp_path, games):
+    _, book = write(tmp_path, games, 4, 'top4.bin')
+    board = [[None] * 10 for _ in range(10)]
+    for orderer, hit in [(None, False), (MoveOrderer(top_k=8), False), (MoveOrderer(top_k=4), True)]:
+        stats = rules.SearchStats()
+        rules.best_move_for_ai(board, PLAYER1_COLOR, 1, stats=stats, orderer=orderer, book=book)
+        assert (stats.nodes == 0) == hit
+    book.close()
+
+
+def test_book_for_another_version_is_rejected(tmp_path):
+    path = tmp_path / 'old.bin'
+    data = bytearray(opening.HEADER.size)
+    opening.HEADER.pack_into(data, 0, opening.MAGIC, opening.VERSION - 1, 10, records.catalog_hash(),
+                             opening.ZOBRIST_SEED, 3, 0)
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        opening.OpeningBook(path)
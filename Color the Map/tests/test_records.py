@@ -0,0 +1,62 @@
+import os
+import random
+import records
+from engine import Game
+
+
+def play_game(size, seed):
+    rng = random.Random(seed)
+    game = Game(size)
+    cells = [(row, col) for row in range(size) for col in range(size)]
+    rng.shuffle(cells)
+    for row, col in cells:
+        if game.game_over:
+            break
+        game.play(row, col)
+    return records.GameRecord.from_game(game, seed, ('random', 'random'))
+
+
+def test_round_trip(tmp_path):
+    games = [play_game(10, seed) for seed in range(5)] + [play_game(20, 5)]
+    path = tmp_path / 'games.ctmr'
+    records.write_records(path, games[:3])
+    records.write_records(path, games[3:], append=True)
+    read = records.read_records(path)
+    assert len(read) == len(games)
+    for record, game in zip(read, games):
+        assert (record.size, record.seed, record.strategies, record.catalog) == \
+               (game.size, game.seed, game.strategies, game.catalog)
+        assert list(record.cells) == list(game.cells)
+        assert record.deltas == game.deltas
+    assert read[-1].cells.itemsize == 2  # Past 16x16 a cell takes two bytes
+
+
+def test_replay_matches_the_engine():
+    for seed in range(5):
+        record = play_game(10, seed)
+        player1, player2, mismatch = records.replay(record)
+        assert mismatch is None
+        assert player1 + player2 == sum(record.deltas)
+
+
+def test_replay_finds_a_changed_score():
+    record = play_game(10, 0)
+    move = next(index for index, delta in enumerate(record.deltas) if delta)
+    deltas = bytearray(record.deltas)
+    deltas[move] = 0
+    tampered = records.GameRecord(record.size, record.seed, record.strategies, record.cells, deltas)
+    assert records.replay(tampered)[2] == move
+
+
+def test_check_flags_another_catalog(capsys):
+    record = play_game(10, 0)
+    stale = records.GameRecord(record.size, record.seed, record.strategies, record.cells, record.deltas,
+                               b'\0' * 8)
+    assert records.check([record], min_rate=0)
+    assert not records.check([stale], min_rate=0)
+    assert 'another shape catalog' in capsys.readouterr().out
+
+
+def test_regression_corpus_replays():
+    corpus = records.read_records(os.path.join(os.path.dirname(__file__), '..', 'corpus', 'regression.ctmr'))
+    assert all(records.replay(record)[2] is None for record in corpus)
@@ -0,0 +1,45 @@
+import pytest
+import rules
+from conftest import random_board
+from constants import PLAYER2_COLOR, WIN_POINTS
+from ordering import MoveOrderer
+from transposition import TranspositionTable
+
+# Banked points from the opening to either side of the WIN_POINTS threshold
+BANKED = [(0, 0), (20, 10), (WIN_POINTS - 30, WIN_POINTS - 5), (WIN_POINTS - 5, WIN_POINTS - 30),
+          (WIN_POINTS - 2, WIN_POINTS - 1), (WIN_POINTS - 14, WIN_POINTS - 14)]
+
+
+def search_score(board, depth, banked, **options):
+    stats = rules.SearchStats()
+    rules.best_move_for_ai(board, PLAYER2_COLOR, depth, stats=stats, banked=banked, **options)
+    return stats.score
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_table_and_orderer_match_plain_search(seed):
+    board = random_board(0.5, seed, size=6)
+    # One table and orderer across every banked total, so entries stored for one can be probed for another
+    table = TranspositionTable(1 << 12, board_size=6)
+    orderer = MoveOrderer()
+    for depth in (2, 3):
+        for banked in BANKED:
+            plain = search_score(board, depth, banked)
+            assert search_score(board, depth, banked, table=table) == pytest.approx(plain)
+            assert search_score(board, depth, banked, orderer=orderer) == pytest.approx(plain)
+            assert search_score(board, depth, banked, table=table, orderer=orderer) == pytest.approx(plain)
+
+
+def test_symmetric_table_matches_plain_search():
+    board = random_board(0.4, 7, size=6)
+    table = TranspositionTable(1 << 12, symmetric=True, board_size=6)
+    for banked in BANKED:
+        assert search_score(board, 3, banked, table=table) == pytest.approx(search_score(board, 3, banked))
+
+
+def test_iterative_deepening_keeps_the_deepest_finished_iteration():
+    board = random_board(0.5, 3, size=6)
+    stats = rules.SearchStats()
+    rules.best_move_for_ai(board, PLAYER2_COLOR, 2, time_limit=60, stats=stats)
+    assert stats.depth == 2
+    assert stats.score == pytest.approx(search_score(board, 2, (0, 0)))
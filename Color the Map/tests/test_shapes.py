@@ -0,0 +1,67 @@
+import pytest
+import rules
+import shapes
+from conftest import random_board
+from constants import PLAYER1_COLOR, PLAYER2_COLOR, SHAPE_CATALOG
+
+
+def test_orientations():
+    l_shape = SHAPE_CATALOG['L*1:']['cells']
+    assert shapes.orientations(l_shape) == [tuple(l_shape)]
+    assert len(shapes.orientations(l_shape, rotations=True)) == 4
+    assert len(shapes.orientations(l_shape, rotations=True, reflections=True)) == 8
+    # The box looks the same every way round
+    assert len(shapes.orientations(SHAPE_CATALOG['Box*2:']['cells'], rotations=True, reflections=True)) == 1
+
+
+def test_compiled_points_apply_the_multiplier():
+    for shape in shapes.COMPILED_SHAPES:
+        spec = SHAPE_CATALOG[shape.name]
+        assert shape.points == spec['points'] * spec['multiplier']
+        assert shape.cells == tuple(spec['cells'])
+
+
+def test_bounds_cover_every_orientation(catalog):
+    for shape in shapes.COMPILED_SHAPES:
+        for (_, coords), (height, width) in zip(shape.variants, shape.bounds):
+            assert min(r for r, c in coords) == 0 and min(c for r, c in coords) == 0
+            assert max(r for r, c in coords) == height - 1 and max(c for r, c in coords) == width - 1
+
+
+@pytest.mark.parametrize('size, fill, seed', [(10, 0.6, 0), (10, 0.9, 1), (5, 0.7, 2), (12, 0.8, 3)])
+def test_cell_index_matches_the_scan(catalog, size, fill, seed):
+    board = random_board(fill, seed, size)
+    for row in range(size):
+        for col in range(size):
+            for color in (PLAYER1_COLOR, PLAYER2_COLOR):
+                assert rules.check_shapes(board, row, col, color) == rules.check_shapes_scan(board, row, col, color)
+                assert rules.check_partial_shapes(board, row, col, color) == pytest.approx(
+                    rules.check_partial_shapes_scan(board, row, col, color))
+
+
+def test_load_catalog_rebuilds_the_cell_index():
+    board = [[None] * 10 for _ in range(10)]
+    for row, col in [(0, 1), (1, 1), (2, 1), (2, 0)]:  # The L mirrored: only scores with reflections
+        board[row][col] = PLAYER1_COLOR
+    assert rules.check_shapes(board, 2, 0, PLAYER1_COLOR) == 0
+    shapes.load_catalog(dict(SHAPE_CATALOG, **{'L*1:': dict(SHAPE_CATALOG['L*1:'], reflections=True)}))
+    try:
+        assert rules.check_shapes(board, 2, 0, PLAYER1_COLOR) == 4
+    finally:
+        shapes.load_catalog()
+    assert rules.check_shapes(board, 2, 0, PLAYER1_COLOR) == 0
+
+
+def test_declared_offsets_are_shifted_to_the_origin():
+    # The shipped L drawn one row up and two columns left must score exactly like the shipped one
+    board = random_board(0.7, 8)
+    expected = [[rules.check_shapes(board, row, col, PLAYER1_COLOR) for col in range(10)] for row in range(10)]
+    moved = dict(SHAPE_CATALOG['L*1:'], cells=[(r - 1, c - 2) for r, c in SHAPE_CATALOG['L*1:']['cells']])
+    shapes.load_catalog(dict(SHAPE_CATALOG, **{'L*1:': moved}))
+    try:
+        assert shapes.COMPILED_SHAPES[0].cells == tuple(SHAPE_CATALOG['L*1:']['cells'])
+        assert shapes.COMPILED_SHAPES[0].bounds[0] == (3, 2)
+        assert [[rules.check_shapes(board, row, col, PLAYER1_COLOR) for col in range(10)]
+                for row in range(10)] == expected
+    finally:
+        shapes.load_catalog()
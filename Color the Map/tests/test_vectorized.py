@@ -0,0 +1,17 @@
+import pytest
+import rules
+from conftest import random_board
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+
+pytest.importorskip('numpy')
+from vectorized import partial_shape_points
+
+
+@pytest.mark.parametrize('size, fill, seed', [(10, 0.0, 0), (10, 0.5, 1), (10, 0.9, 2), (7, 0.4, 3), (23, 0.3, 4)])
+def test_partial_shape_points_matches_scan(catalog, size, fill, seed):
+    board = random_board(fill, seed, size)
+    for color in (PLAYER1_COLOR, PLAYER2_COLOR):
+        cells, points = partial_shape_points(board, color)
+        scan_cells, scan_points = rules.partial_points_scan(board, color)
+        assert [list(cell) for cell in cells] == [list(cell) for cell in scan_cells]
+        assert list(points) == pytest.approx(scan_points)
@@ -0,0 +1,24 @@
+from functools import lru_cache
+import pygame
+
+# Shared by interface, main and level: fonts are built once per size and rendered
+# strings are kept until evicted, so an unchanged label costs one dict lookup per frame.
+TEXT_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """The default pygame font at the given size."""
+    return pygame.font.Font(None, size)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, size, color):
+    """Antialiased surface for text; shared between callers, so blit it but never draw on it."""
+    return get_font(size).render(text, True, color)
+
+
+def clear():
+    """Drop every cached font and surface (needed after pygame.quit())."""
+    render_text.cache_clear()
+    get_font.cache_clear()
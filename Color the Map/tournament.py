@@ -0,0 +1,137 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from constants import PLAYER1_COLOR, PLAYER2_COLOR
+from engine import Game
+from profiling import percentile
+from records import GameRecord, write_records
+from strategies import STRATEGIES
+
+ELO_START = 1500
+ELO_K = 16
+
+_book = None  # This process's opening.OpeningBook, mapped once by use_book()
+
+
+def use_book(path):
+    """Map the opening book at path for every game this process plays (a pool initializer)."""
+    global _book
+    from opening import OpeningBook
+    _book = OpeningBook(path) if path else None
+
+
+def play_match(task):
+    """Worker: play one game between two registered strategies.
+
+    task is (index, first, second, seed); first plays Player 1 and moves first.
+    Returns (index, first, second, winner name or None, first's points,
+    second's points, first's move latencies, second's move latencies,
+    records.GameRecord of the game).
+    """
+    index, first, second, seed = task
+    random.seed(seed)
+    game = Game(book=_book)
+    players = {PLAYER1_COLOR: first, PLAYER2_COLOR: second}
+    latencies = {PLAYER1_COLOR: [], PLAYER2_COLOR: []}
+    while not game.game_over:
+        player_color = game.current_player
+        start = time.perf_counter()
+        row, col = STRATEGIES[players[player_color]](game)
+        latencies[player_color].append(time.perf_counter() - start)
+        game.play(row, col)
+    winner = players.get(game.winner)
+    return (index, first, second, winner, game.player1_points, game.player2_points,
+            latencies[PLAYER1_COLOR], latencies[PLAYER2_COLOR], GameRecord.from_game(game, seed, (first, second)))
+
+
+def schedule(names, games, seed):
+    """Round-robin tasks: every pair of strategies, alternating who moves first, one seed per game."""
+    pairs = list(itertools.combinations(names, 2))
+    rng = random.Random(seed)
+    tasks = []
+    for index in range(games):
+        first, second = pairs[index % len(pairs)]
+        if index // len(pairs) % 2:
+            first, second = second, first
+        tasks.append((index, first, second, rng.getrandbits(32)))
+    return tasks
+
+
+def run(names, games, seed=0, workers=None, book=None):
+    """Play the tournament and return the per-game results in schedule order.
+
+    book is the path of an opening book; every worker maps the same file.
+    """
+    tasks = schedule(names, games, seed)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        use_book(book)
+        return [play_match(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_book, initargs=(book,)) as executor:
+        return list(executor.map(play_match, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+
+
+def standings(names, results):
+    """Per-strategy W/L/T, Elo (updated game by game in schedule order), mean points and latencies."""
+    table = {name: {'wins': 0, 'losses': 0, 'ties': 0, 'elo': ELO_START, 'points': [], 'latencies': []}
+             for name in names}
+    for index, first, second, winner, first_points, second_points, first_times, second_times, _ in results:
+        a, b = table[first], table[second]
+        expected = 1 / (1 + 10 ** ((b['elo'] - a['elo']) / 400))
+        score = 1 if winner == first else 0 if winner == second else 0.5
+        a['elo'] += ELO_K * (score - expected)
+        b['elo'] -= ELO_K * (score - expected)
+        if winner is None:
+            a['ties'] += 1
+            b['ties'] += 1
+        else:
+            table[winner]['wins'] += 1
+            table[second if winner == first else first]['losses'] += 1
+        a['points'].append(first_points)
+        b['points'].append(second_points)
+        a['latencies'].extend(first_times)
+        b['latencies'].extend(second_times)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin AI-vs-AI tournament between registered strategies.")
+    parser.add_argument('strategies', nargs='*', default=['fuzzy', 'minimax', 'greedy', 'random'],
+                        help=f"strategies to enter, at least two of: {', '.join(STRATEGIES)}")
+    parser.add_argument('-n', '--games', type=int, default=100, help="total number of games")
+    parser.add_argument('--seed', type=int, default=0, help="tournament seed; the same seed replays the same games")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument('--book', metavar='PATH', help="opening book for the AIs (built with opening.py)")
+    parser.add_argument('--record', metavar='PATH', help="write every game to PATH as binary game records")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+    if len(set(args.strategies)) < 2:
+        parser.error("need at least two different strategies")
+    names = list(dict.fromkeys(args.strategies))
+
+    start = time.perf_counter()
+    results = run(names, args.games, args.seed, args.workers, args.book)
+    elapsed = time.perf_counter() - start
+    table = standings(names, results)
+    if args.record:
+        write_records(args.record, [result[-1] for result in results])
+
+    print(f"{len(results)} games in {elapsed:.1f}s (seed {args.seed})")
+    print(f"{'strategy':<12} {'W':>5} {'L':>5} {'T':>5} {'Elo':>6} {'points':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in sorted(table.items(), key=lambda item: -item[1]['elo']):
+        latencies = row['latencies'] or [0]
+        print(f"{name:<12} {row['wins']:>5} {row['losses']:>5} {row['ties']:>5} {row['elo']:>6.0f} "
+              f"{sum(row['points']) / max(1, len(row['points'])):>7.1f} "
+              f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.95) * 1000:>8.2f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
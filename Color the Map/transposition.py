@@ -0,0 +1,168 @@
+import random
+from constants import BOARD_SIZE, PLAYER1_COLOR, PLAYER2_COLOR
+from shapes import COMPILED_SHAPES, normalize
+
+EXACT, LOWER, UPPER = 0, 1, 2  # Bound types, from the point of view of the side to move
+
+
+def symmetry_maps(size):
+    """The 8 symmetries of a size x size board as functions (row, col) -> (row, col)."""
+    last = size - 1
+    return [
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    ]
+
+
+def catalog_symmetries(compiled_shapes=COMPILED_SHAPES, size=BOARD_SIZE):
+    """Indices of the board symmetries that map every shape's set of orientations onto itself.
+
+    Only these can be folded into one key without changing check_shapes results.
+    """
+    kept = []
+    for index, transform in enumerate(symmetry_maps(size)):
+        if all({normalize([transform(r, c) for r, c in coords]) for variant_name, coords in shape.variants} ==
+               {normalize(coords) for variant_name, coords in shape.variants}
+               for shape in compiled_shapes):
+            kept.append(index)
+    return kept
+
+
+class ZobristHasher:
+    """Zobrist hash of a board, updated with toggle() as stones are placed and removed.
+
+    With symmetric=True one hash is kept per board symmetry the shape catalog
+    allows, and key() returns the smallest, so equivalent positions share an
+    entry. The partial-shape evaluation clips placements at the board edge
+    and is only approximately symmetric, so this is opt-in.
+    """
+
+    def __init__(self, size=BOARD_SIZE, symmetric=False, seed=0x5EED):
+        rng = random.Random(seed)
+        cells = size * size
+        self.size = size
+        self.keys = {color: [rng.getrandbits(64) for _ in range(cells)] for color in (PLAYER1_COLOR, PLAYER2_COLOR)}
+        self.side = {color: rng.getrandbits(64) for color in (PLAYER1_COLOR, PLAYER2_COLOR)}
+        maps = symmetry_maps(size)
+        symmetries = catalog_symmetries(size=size) if symmetric else [0]
+        # perms[i][cell] is where symmetry i sends cell; inverse maps it back
+        self.perms = []
+        self.inverse = []
+        for index in symmetries:
+            perm = [0] * cells
+            inverse = [0] * cells
+            for cell in range(cells):
+                r, c = maps[index](cell // size, cell % size)
+                perm[cell] = r * size + c
+                inverse[r * size + c] = cell
+            self.perms.append(perm)
+            self.inverse.append(inverse)
+        self.hashes = [0] * len(self.perms)
+
+    def set_board(self, board):
+        """Recompute the hashes from scratch for a list-of-lists board."""
+        self.hashes = [0] * len(self.perms)
+        for row in range(self.size):
+            for col in range(self.size):
+                if board[row][col] is not None:
+                    self.toggle(row, col, board[row][col])
+
+    def board_key(self, board, player_color):
+        """(key, symmetry) for a list-of-lists board, computed without touching the running hashes."""
+        size = self.size
+        hashes = [0] * len(self.perms)
+        for row in range(size):
+            for col in range(size):
+                color = board[row][col]
+                if color is not None:
+                    cell = row * size + col
+                    keys = self.keys[color]
+                    for index, perm in enumerate(self.perms):
+                        hashes[index] ^= keys[perm[cell]]
+        symmetry = hashes.index(min(hashes)) if len(hashes) > 1 else 0
+        return hashes[symmetry] ^ self.side[player_color], symmetry
+
+    def toggle(self, row, col, color):
+        """Add or remove a stone; calling it twice restores the previous hash."""
+        cell = row * self.size + col
+        keys = self.keys[color]
+        hashes = self.hashes
+        for index, perm in enumerate(self.perms):
+            hashes[index] ^= keys[perm[cell]]
+
+    def key(self, player_color):
+        """(key, symmetry) for the position with player_color to move."""
+        hashes = self.hashes
+        symmetry = hashes.index(min(hashes)) if len(hashes) > 1 else 0
+        return hashes[symmetry] ^ self.side[player_color], symmetry
+
+    def to_canonical(self, move, symmetry):
+        cell = self.perms[symmetry][move[0] * self.size + move[1]]
+        return cell // self.size, cell % self.size
+
+    def from_canonical(self, move, symmetry):
+        cell = self.inverse[symmetry][move[0] * self.size + move[1]]
+        return cell // self.size, cell % self.size
+
+
+class TranspositionTable:
+    """Bounded table of searched positions: (key, depth, score, bound, best move, age).
+
+    Each slot has two entries: a depth-preferred one, replaced only by a
+    deeper search or an entry from an older search, and an always-replace one
+    that catches everything else.
+    """
+
+    def __init__(self, size=1 << 16, symmetric=False, board_size=BOARD_SIZE):
+        self.size = size
+        self.hasher = ZobristHasher(board_size, symmetric)
+        self.deep = [None] * size
+        self.recent = [None] * size
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self, board):
+        """Start a new search from board: rehash it and age the existing entries."""
+        self.hasher.set_board(board)
+        self.age += 1
+
+    def probe(self, key):
+        slot = key % self.size
+        for entry in (self.deep[slot], self.recent[slot]):
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        slot = key % self.size
+        entry = (key, depth, score, bound, move, self.age)
+        self.stores += 1
+        old = self.deep[slot]
+        if old is None or old[0] == key or depth >= old[1] or old[5] != self.age:
+            if old is not None and old[0] != key:
+                self.overwrites += 1
+            self.deep[slot] = entry
+        else:
+            if self.recent[slot] is not None and self.recent[slot][0] != key:
+                self.overwrites += 1
+            self.recent[slot] = entry
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def clear(self):
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.hits = self.misses = self.stores = self.overwrites = 0
@@ -0,0 +1,34 @@
+import numpy as np
+from shapes import SHAPES
+
+
+def partial_shape_points(board, player_color, shapes=SHAPES):
+    """Partial-shape score of every empty cell in one pass over the board.
+
+    Equivalent to placing player_color on each empty cell in turn and calling
+    rules.check_partial_shapes there. Returns (board_position, points) in the
+    same row-major order geneticAlgo builds them in.
+    """
+    rows, cols = len(board), len(board[0])
+    empty = np.array([[cell is None for cell in row] for row in board], dtype=bool)
+    owned = np.array([[cell == player_color for cell in row] for row in board], dtype=np.float64)
+
+    points = np.zeros((rows, cols))
+    for coords, base_points in shapes.values():
+        # completed[r, c]: owned cells of the shape anchored at (r, c), clipped to the board
+        pad_r = max(dr for dr, dc in coords)
+        pad_c = max(dc for dr, dc in coords)
+        padded = np.pad(owned, ((0, pad_r), (0, pad_c)))
+        completed = np.zeros((rows, cols))
+        for dr, dc in coords:
+            completed += padded[dr:dr + rows, dc:dc + cols]
+        # The scored cell itself is empty, so placing on it completes one more cell
+        share = (((completed + 1) / len(coords)) * 100 / 100) * base_points
+
+        # Cell (r, c) collects every anchor (r - dr, c - dc) still on the board, in offset order
+        for dr, dc in coords:
+            points[dr:, dc:] += share[:rows - dr, :cols - dc]
+
+    empty_rows, empty_cols = np.nonzero(empty)
+    board_position = [[int(row), int(col)] for row, col in zip(empty_rows, empty_cols)]
+    return board_position, points[empty_rows, empty_cols].tolist()